@@ -1,5 +1,8 @@
+import asyncio
+import time
+import uuid
 from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set
 from pydantic import HttpUrl
 from app.models.property import Property
 from app.services.notion_service import NotionService
@@ -9,6 +12,21 @@ from app.scrapers.scraper_factory import ScraperFactory
 
 router = APIRouter(prefix="/notion", tags=["notion"])
 
+# Concurrent Notion page writes per batch job, kept within Notion's ~3 requests/second limit
+_BATCH_SAVE_CONCURRENCY = 3
+
+# Batch save jobs by ID, kept in memory until evicted after finishing
+_batch_jobs: Dict[str, Dict[str, Any]] = {}
+
+# How long a finished job's results stay available for polling, in seconds
+_FINISHED_JOB_TTL = 3600.0
+
+# time.monotonic() at which each job finished, oldest first
+_job_finished_at: Dict[str, float] = {}
+
+# Strong references to running jobs so they are not garbage collected mid-run
+_batch_tasks: Set[asyncio.Task] = set()
+
 # Dependency injection
 def get_notion_service() -> NotionService:
     return NotionService()
@@ -173,54 +191,115 @@ async def check_notion_database(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error checking database: {str(e)}")
 
-@router.post("/properties/batch-save")
+async def _save_one_to_notion(
+    property_id: str,
+    notion_service: NotionService,
+    property_service: PropertyService,
+    semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """Save a single property for a batch job, reporting failures in the result"""
+    try:
+        # Get the property
+        property_obj = await property_service.get_property(property_id)
+        if not property_obj:
+            return {
+                "property_id": property_id,
+                "success": False,
+                "error": "Property not found"
+            }
+        
+        # Save to Notion
+        async with semaphore:
+            result = await notion_service.save_property_to_notion(property_obj)
+        return {
+            "property_id": property_id,
+            **result
+        }
+        
+    except Exception as e:
+        return {
+            "property_id": property_id,
+            "success": False,
+            "error": str(e)
+        }
+
+async def _run_batch_save(
+    job_id: str,
+    property_ids: list[str],
+    notion_service: NotionService,
+    property_service: PropertyService
+) -> None:
+    """Save a batch of properties in the background and record the outcome on the job"""
+    job = _batch_jobs[job_id]
+    job["status"] = "running"
+    try:
+        semaphore = asyncio.Semaphore(_BATCH_SAVE_CONCURRENCY)
+        results = await asyncio.gather(*[
+            _save_one_to_notion(property_id, notion_service, property_service, semaphore)
+            for property_id in property_ids
+        ])
+        
+        # Count successes and failures
+        successful = sum(1 for r in results if r.get("success", False))
+        job.update(
+            status="done",
+            successful=successful,
+            failed=len(results) - successful,
+            results=results
+        )
+        
+    except Exception as e:
+        job.update(status="failed", error=f"Error in batch save: {str(e)}")
+    finally:
+        _job_finished_at[job_id] = time.monotonic()
+
+def _evict_finished_jobs() -> None:
+    """Drop finished jobs whose results have been kept longer than _FINISHED_JOB_TTL"""
+    cutoff = time.monotonic() - _FINISHED_JOB_TTL
+    for job_id, finished_at in list(_job_finished_at.items()):
+        if finished_at > cutoff:
+            break
+        del _job_finished_at[job_id]
+        _batch_jobs.pop(job_id, None)
+
+@router.post("/properties/batch-save", status_code=202)
 async def batch_save_properties_to_notion(
     property_ids: list[str],
     notion_service: NotionService = Depends(get_notion_service),
     property_service: PropertyService = Depends(get_property_service)
 ):
     """
-    Save multiple properties to Notion database
+    Start saving multiple properties to Notion database
+    
+    Returns a job ID immediately; poll GET /notion/jobs/{job_id} for the results.
     """
     try:
-        results = []
-        
-        for property_id in property_ids:
-            try:
-                # Get the property
-                property_obj = await property_service.get_property(property_id)
-                if not property_obj:
-                    results.append({
-                        "property_id": property_id,
-                        "success": False,
-                        "error": "Property not found"
-                    })
-                    continue
-                
-                # Save to Notion
-                result = await notion_service.save_property_to_notion(property_obj)
-                results.append({
-                    "property_id": property_id,
-                    **result
-                })
-                
-            except Exception as e:
-                results.append({
-                    "property_id": property_id,
-                    "success": False,
-                    "error": str(e)
-                })
+        _evict_finished_jobs()
+        job_id = uuid.uuid4().hex
+        _batch_jobs[job_id] = {
+            "job_id": job_id,
+            "status": "pending",
+            "total_properties": len(property_ids)
+        }
         
-        # Count successes and failures
-        successful = sum(1 for r in results if r.get("success", False))
-        failed = len(results) - successful
+        task = asyncio.create_task(
+            _run_batch_save(job_id, property_ids, notion_service, property_service)
+        )
+        _batch_tasks.add(task)
+        task.add_done_callback(_batch_tasks.discard)
         
-        return {
-            "total_properties": len(property_ids),
-            "successful": successful,
-            "failed": failed,
-            "results": results
-        }
+        return _batch_jobs[job_id]
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error in batch save: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error starting batch save: {str(e)}")
+
+@router.get("/jobs/{job_id}")
+async def get_batch_save_job(job_id: str):
+    """
+    Get the status and, once finished, the results of a batch save job
+    """
+    _evict_finished_jobs()
+    job = _batch_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
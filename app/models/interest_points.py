@@ -1,7 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import List, Optional, Dict, Any
 from enum import Enum
 from datetime import datetime, date, timedelta
+from operator import attrgetter
+
+# Sort key for distance and prediction results
+_BY_DURATION = attrgetter("duration_minutes")
 
 
 class TransportationMode(str, Enum):
@@ -71,6 +75,17 @@ class PredictionTimeResult(BaseModel):
     total_walking_minutes: Optional[int] = Field(None, description="Total walking time in minutes")
     total_walking_distance_km: Optional[float] = Field(None, description="Total walking distance in kilometers")
     calculated_at: datetime = Field(default_factory=datetime.now)
+    
+    @model_validator(mode="after")
+    def _fill_total_walking_minutes(self) -> "PredictionTimeResult":
+        """Derive the walking time from the pedestrian route sections when it was not given"""
+        if self.total_walking_minutes is None and self.route_details:
+            self.total_walking_minutes = sum(
+                section.get("duration_minutes", 0)
+                for section in self.route_details
+                if section.get("type") == "pedestrian"
+            )
+        return self
 
 class PropertyDistanceInfo(BaseModel):
     """Distance information for a property to all interest points"""
@@ -92,13 +107,13 @@ class PropertyDistanceInfo(BaseModel):
         """Get the closest interest point by duration"""
         if not self.distances:
             return None
-        return min(self.distances, key=lambda x: x.duration_minutes)
+        return min(self.distances, key=_BY_DURATION)
     
     def get_farthest_point(self) -> Optional[DistanceResult]:
         """Get the farthest interest point by duration"""
         if not self.distances:
             return None
-        return max(self.distances, key=lambda x: x.duration_minutes)
+        return max(self.distances, key=_BY_DURATION)
 
 class PropertyPredictionInfo(BaseModel):
     """Prediction time information for a property to all interest points for next Friday"""
@@ -121,13 +136,13 @@ class PropertyPredictionInfo(BaseModel):
         """Get the fastest prediction by duration"""
         if not self.predictions:
             return None
-        return min(self.predictions, key=lambda x: x.duration_minutes)
+        return min(self.predictions, key=_BY_DURATION)
     
     def get_slowest_prediction(self) -> Optional[PredictionTimeResult]:
         """Get the slowest prediction by duration"""
         if not self.predictions:
             return None
-        return max(self.predictions, key=lambda x: x.duration_minutes)
+        return max(self.predictions, key=_BY_DURATION)
 
 class InterestPointsConfig(BaseModel):
     """Configuration for interest points system"""
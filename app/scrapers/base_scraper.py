@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 from app.models.property import Property, WebsiteListing, WebsiteSource
 from pydantic import HttpUrl
 
@@ -10,7 +10,7 @@ class BaseScraper(ABC):
         self.website = website
     
     @abstractmethod
-    async def scrape_property(self, url: HttpUrl) -> Optional[Property]:
+    async def scrape_property(self, url: Union[str, HttpUrl]) -> Optional[Property]:
         """
         Scrape a property from a given URL
         
@@ -23,7 +23,7 @@ class BaseScraper(ABC):
         pass
     
     @abstractmethod
-    def can_handle_url(self, url: HttpUrl) -> bool:
+    def can_handle_url(self, url: Union[str, HttpUrl]) -> bool:
         """
         Check if this scraper can handle the given URL
         
@@ -36,7 +36,7 @@ class BaseScraper(ABC):
         pass
     
     @abstractmethod
-    def extract_listing_id(self, url: HttpUrl) -> Optional[str]:
+    def extract_listing_id(self, url: Union[str, HttpUrl]) -> Optional[str]:
         """
         Extract the listing ID from a URL
         
@@ -48,7 +48,7 @@ class BaseScraper(ABC):
         """
         pass
     
-    def create_website_listing(self, url: HttpUrl, price: float, 
+    def create_website_listing(self, url: Union[str, HttpUrl], price: float, 
                              title: Optional[str] = None,
                              description: Optional[str] = None,
                              raw_data: Optional[Dict[str, Any]] = None) -> WebsiteListing:
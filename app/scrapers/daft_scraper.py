@@ -1,6 +1,6 @@
 import re
 import asyncio
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Union
 from pydantic import HttpUrl
 from bs4 import BeautifulSoup
 import aiohttp
@@ -38,7 +38,7 @@ class DaftScraper(BaseScraper):
             )
         return self.session
     
-    def can_handle_url(self, url: HttpUrl) -> bool:
+    def can_handle_url(self, url: Union[str, HttpUrl]) -> bool:
         """
         Check if this is a valid Daft.ie property listing URL
         
@@ -68,7 +68,7 @@ class DaftScraper(BaseScraper):
         
         return False
     
-    def extract_listing_id(self, url: HttpUrl) -> Optional[str]:
+    def extract_listing_id(self, url: Union[str, HttpUrl]) -> Optional[str]:
         """
         Extract listing ID from Daft URL
         
@@ -514,7 +514,7 @@ class DaftScraper(BaseScraper):
         
         return None
     
-    async def scrape_property(self, url: HttpUrl) -> Optional[Property]:
+    async def scrape_property(self, url: Union[str, HttpUrl]) -> Optional[Property]:
         """
         Scrape property data from Daft.ie
         """
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 from pydantic import HttpUrl
 from app.scrapers.base_scraper import BaseScraper
 from app.scrapers.daft_scraper import DaftScraper
@@ -15,14 +15,14 @@ class ScraperFactory:
             # DonDealScraper(),
         ]
     
-    def get_scraper_for_url(self, url: HttpUrl) -> Optional[BaseScraper]:
+    def get_scraper_for_url(self, url: Union[str, HttpUrl]) -> Optional[BaseScraper]:
         """Get the appropriate scraper for a given URL"""
         for scraper in self.scrapers:
             if scraper.can_handle_url(url):
                 return scraper
         return None
     
-    async def scrape_property(self, url: HttpUrl) -> Optional[Property]:
+    async def scrape_property(self, url: Union[str, HttpUrl]) -> Optional[Property]:
         """Scrape a property using the appropriate scraper"""
         scraper = self.get_scraper_for_url(url)
         if not scraper:
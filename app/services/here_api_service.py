@@ -1,11 +1,16 @@
+import asyncio
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Optional, Tuple
 from datetime import date, datetime, timedelta
 from app.models.interest_points import TransportationMode, InterestPoint
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent HERE requests; also sizes the session's connection pool
+MAX_CONCURRENT_REQUESTS = 8
+
 
 class HereApiService:
     """Service for interacting with HERE API"""
@@ -14,6 +19,18 @@ class HereApiService:
         self.api_key = api_key
         self.base_url = "https://router.hereapi.com/v8"
         self.transit_url = "https://transit.router.hereapi.com/v8"
+        # Pooled session so repeat calls reuse TCP/TLS connections. It is shared
+        # by the asyncio.to_thread workers, so each host's pool (router and
+        # transit router) holds one connection per concurrent request
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=2, pool_maxsize=MAX_CONCURRENT_REQUESTS),
+        )
+    
+    def close(self) -> None:
+        """Close the pooled HTTP session"""
+        self.session.close()
         
     def get_public_transit_route(
         self,
@@ -50,7 +67,7 @@ class HereApiService:
                 params["departureTime"] = departure_time
             
             logger.info(f"Requesting public transit route from {origin} to {destination}")
-            response = requests.get(url, params=params, timeout=30)
+            response = self.session.get(url, params=params, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -112,7 +129,7 @@ class HereApiService:
             }
             
             logger.info(f"Requesting route from {origin} to {destination} via {here_transport_mode}")
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -184,7 +201,7 @@ class HereApiService:
                 params["alternatives"] = 1
             
             logger.info(f"Requesting matrix routing for {len(origins)} origins to {len(destinations)} destinations via {here_transport_mode}")
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -222,15 +239,18 @@ class HereApiService:
             # Format departure time for API
             departure_time = f"{next_friday.isoformat()}T09:00:00"
             
-            # Get route summary
+            # Get route summary (the HTTP client is blocking, so run it off the event loop
+            # to let concurrent predictions overlap)
             if transport_mode == TransportationMode.PUBLIC_TRANSPORT:
-                route_data = self.get_public_transit_route(
+                route_data = await asyncio.to_thread(
+                    self.get_public_transit_route,
                     (origin_lat, origin_lng),
                     (dest_lat, dest_lng),
                     departure_time
                 )
             else:
-                route_data = self.get_route_summary(
+                route_data = await asyncio.to_thread(
+                    self.get_route_summary,
                     (origin_lat, origin_lng),
                     (dest_lat, dest_lng),
                     transport_mode
@@ -1,21 +1,79 @@
+import asyncio
 import logging
 import json
-from typing import List, Optional, Dict, Any
+import math
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from operator import attrgetter
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
 from pathlib import Path
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from app.models.interest_points import InterestPoint, TransportationMode, PropertyPredictionInfo, PredictionTimeResult
-from app.services.here_api_service import HereApiService
+from app.services.here_api_service import HereApiService, MAX_CONCURRENT_REQUESTS
 from app.config import config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Approximate length of one degree of latitude, used to size search boxes
+_KM_PER_DEGREE = 111.32
+
+# Mean Earth radius for great-circle distances
+_EARTH_RADIUS_KM = 6371.0088
+
+
+def _haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in km between two points given in degrees"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * _EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+@lru_cache(maxsize=8)
+def _parse_config_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a config file, cached per path and modification time
+
+    Callers must treat the result as read-only since it is shared between services.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@lru_cache(maxsize=1)
+def _next_friday(today: date) -> date:
+    """Get the Friday after today, cached until the date changes"""
+    days_ahead = 4 - today.weekday()  # Friday is 4 (Monday is 0)
+    
+    if days_ahead <= 0:  # Target day already happened this week
+        days_ahead += 7
+    
+    return today + timedelta(days=days_ahead)
+
 
 class InterestPointsService:
     """Service for managing interest points"""
     
-    def __init__(self, config_file_path: str = "interest_points_config.json"):
+    def __init__(
+        self,
+        config_file_path: str = "interest_points_config.json",
+        prediction_concurrency: int = MAX_CONCURRENT_REQUESTS
+    ):
         self.config_file_path = Path(config_file_path)
+        self.prediction_concurrency = prediction_concurrency
         self.interest_points: List[InterestPoint] = []
+        # Index of interest points by ID, kept in sync with interest_points
+        self._points_by_id: Dict[str, InterestPoint] = {}
+        # Points sorted by latitude for radius queries, rebuilt lazily after changes
+        self._latitude_index: Optional[Tuple[List[float], List[InterestPoint]]] = None
+        # Point coordinates in radians (latitudes, their cosines, longitudes), built lazily
+        self._radian_coords: Optional[Tuple[List[float], List[float], List[float]]] = None
         self.here_service: Optional[HereApiService] = None
         self.load_interest_points()
     
@@ -26,8 +84,11 @@ class InterestPointsService:
                 logger.warning(f"Configuration file {self.config_file_path} not found")
                 return
             
-            with open(self.config_file_path, 'r') as f:
-                config_data = json.load(f)
+            # Reuse the parsed file across services until it changes on disk
+            config_data = _parse_config_file(
+                str(self.config_file_path.resolve()),
+                self.config_file_path.stat().st_mtime_ns
+            )
             
             # Load interest points
             if "interest_points" in config_data:
@@ -61,11 +122,13 @@ class InterestPointsService:
                             default_transportation_mode=transport_mode
                         )
                         self.interest_points.append(point)
+                        self._points_by_id.setdefault(point.id, point)
                         
                     except Exception as e:
                         logger.error(f"Error loading interest point {point_data.get('id', 'unknown')}: {e}")
                         continue
             
+            self._invalidate_spatial_indexes()
             logger.info(f"Loaded {len(self.interest_points)} interest points")
             
         except Exception as e:
@@ -81,15 +144,65 @@ class InterestPointsService:
     
     def get_interest_point_by_id(self, point_id: str) -> Optional[InterestPoint]:
         """Get interest point by ID"""
-        for point in self.interest_points:
-            if point.id == point_id:
-                return point
-        return None
+        return self._points_by_id.get(point_id)
     
     def get_interest_points_by_category(self, category: str) -> List[InterestPoint]:
         """Get interest points by category"""
         return [point for point in self.interest_points if point.category == category]
     
+    def distances_from(self, latitude: float, longitude: float) -> List[float]:
+        """Get great-circle distances in km from a location to every interest point, in list order"""
+        if self._radian_coords is None:
+            latitudes = [math.radians(point.latitude) for point in self.interest_points]
+            self._radian_coords = (
+                latitudes,
+                [math.cos(lat) for lat in latitudes],
+                [math.radians(point.longitude) for point in self.interest_points]
+            )
+        latitudes, cos_latitudes, longitudes = self._radian_coords
+        
+        lat, lng = math.radians(latitude), math.radians(longitude)
+        cos_lat = math.cos(lat)
+        sin, asin, sqrt = math.sin, math.asin, math.sqrt
+        return [
+            2 * _EARTH_RADIUS_KM * asin(sqrt(
+                sin((point_lat - lat) / 2) ** 2 + cos_lat * cos_point_lat * sin((point_lng - lng) / 2) ** 2
+            ))
+            for point_lat, cos_point_lat, point_lng in zip(latitudes, cos_latitudes, longitudes)
+        ]
+    
+    def get_interest_points_within(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float
+    ) -> List[InterestPoint]:
+        """Get interest points within radius_km (great-circle) of a location"""
+        lat_delta = radius_km / _KM_PER_DEGREE
+        lng_delta = radius_km / (_KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 1e-6))
+        
+        # Narrow to the latitude band by bisection, then check the box and exact distance
+        latitudes, ordered = self._get_latitude_index()
+        start = bisect_left(latitudes, latitude - lat_delta)
+        end = bisect_right(latitudes, latitude + lat_delta)
+        return [
+            point for point in ordered[start:end]
+            if abs(point.longitude - longitude) <= lng_delta
+            and _haversine_km(latitude, longitude, point.latitude, point.longitude) <= radius_km
+        ]
+    
+    def _get_latitude_index(self) -> Tuple[List[float], List[InterestPoint]]:
+        """Get the latitudes and points sorted by latitude, building them if stale"""
+        if self._latitude_index is None:
+            ordered = sorted(self.interest_points, key=attrgetter("latitude"))
+            self._latitude_index = ([point.latitude for point in ordered], ordered)
+        return self._latitude_index
+    
+    def _invalidate_spatial_indexes(self) -> None:
+        """Drop the lazily built coordinate indexes after the points change"""
+        self._latitude_index = None
+        self._radian_coords = None
+    
     def add_interest_point(self, point: InterestPoint) -> bool:
         """Add a new interest point"""
         try:
@@ -99,6 +212,8 @@ class InterestPointsService:
                 return False
             
             self.interest_points.append(point)
+            self._points_by_id[point.id] = point
+            self._invalidate_spatial_indexes()
             logger.info(f"Added interest point: {point.name}")
             return True
             
@@ -119,6 +234,12 @@ class InterestPointsService:
                 if hasattr(point, field):
                     setattr(point, field, value)
             
+            # Re-key the index if the ID itself changed
+            if point.id != point_id:
+                del self._points_by_id[point_id]
+                self._points_by_id[point.id] = point
+            self._invalidate_spatial_indexes()
+            
             logger.info(f"Updated interest point: {point.name}")
             return True
             
@@ -135,6 +256,8 @@ class InterestPointsService:
                 return False
             
             self.interest_points.remove(point)
+            del self._points_by_id[point_id]
+            self._invalidate_spatial_indexes()
             logger.info(f"Deleted interest point: {point.name}")
             return True
             
@@ -225,42 +348,13 @@ class InterestPointsService:
             # Get HERE service
             here_service = self.get_here_service()
             
-            # Calculate predictions for each interest point
-            predictions = []
-            for point in active_points:
-                try:
-                    # Use the point's default transportation mode
-                    transport_mode = point.default_transportation_mode
-                    
-                    # Calculate prediction time using the updated HERE API service
-                    prediction_data = await here_service.calculate_prediction_time(
-                        latitude, longitude,
-                        point.latitude, point.longitude,
-                        transport_mode
-                    )
-                    
-                    if prediction_data:
-                        # Create prediction result from the API response
-                        prediction = PredictionTimeResult(
-                            origin_point_id="property",
-                            destination_point_id=point.id,
-                            transportation_mode=transport_mode,
-                            distance_km=prediction_data.get("distance_km", 0),
-                            duration_minutes=prediction_data.get("duration_minutes", 0),
-                            prediction_date=next_friday,
-                            departure_time=prediction_data.get("departure_time", "09:00"),
-                            arrival_time=prediction_data.get("arrival_time", "09:00"),
-                            route_summary=f"Route to {point.name}",
-                            route_details=prediction_data.get("route_details"),
-                            total_walking_minutes=prediction_data.get("total_walking_minutes"),
-                            total_walking_distance_km=prediction_data.get("total_walking_distance_km"),
-                            calculated_at=datetime.now()
-                        )
-                        predictions.append(prediction)
-                        
-                except Exception as e:
-                    logger.error(f"Error calculating prediction for point {point.id}: {e}")
-                    continue
+            # Route to every interest point concurrently, capped to avoid flooding the API
+            semaphore = asyncio.Semaphore(self.prediction_concurrency)
+            results = await asyncio.gather(*[
+                self._predict_for_point(here_service, semaphore, point, latitude, longitude, next_friday)
+                for point in active_points
+            ])
+            predictions = [prediction for prediction in results if prediction is not None]
             
             # Create and return prediction info
             prediction_info = PropertyPredictionInfo(
@@ -288,18 +382,84 @@ class InterestPointsService:
                 calculated_at=datetime.now()
             )
 
+    async def iter_predictions_for_property(
+        self,
+        latitude: float,
+        longitude: float
+    ) -> AsyncIterator[PredictionTimeResult]:
+        """Yield next-Friday predictions from a property as each interest point's route completes"""
+        active_points = self.get_active_interest_points()
+        if not active_points:
+            logger.warning("No active interest points found")
+            return
+        
+        here_service = self.get_here_service()
+        next_friday = self._get_next_friday_9am()
+        semaphore = asyncio.Semaphore(self.prediction_concurrency)
+        tasks = [
+            asyncio.create_task(
+                self._predict_for_point(here_service, semaphore, point, latitude, longitude, next_friday)
+            )
+            for point in active_points
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                prediction = await next_done
+                if prediction is not None:
+                    yield prediction
+        finally:
+            # Stop outstanding requests if the caller exits early
+            for task in tasks:
+                task.cancel()
+    
+    async def _predict_for_point(
+        self,
+        here_service: HereApiService,
+        semaphore: asyncio.Semaphore,
+        point: InterestPoint,
+        latitude: float,
+        longitude: float,
+        prediction_date: date
+    ) -> Optional[PredictionTimeResult]:
+        """Calculate the prediction from a property to one interest point, or None on failure"""
+        try:
+            # Use the point's default transportation mode
+            transport_mode = point.default_transportation_mode
+            
+            async with semaphore:
+                prediction_data = await here_service.calculate_prediction_time(
+                    latitude, longitude,
+                    point.latitude, point.longitude,
+                    transport_mode
+                )
+            
+            if not prediction_data:
+                return None
+            
+            # Create prediction result from the API response
+            return PredictionTimeResult(
+                origin_point_id="property",
+                destination_point_id=point.id,
+                transportation_mode=transport_mode,
+                distance_km=prediction_data.get("distance_km", 0),
+                duration_minutes=prediction_data.get("duration_minutes", 0),
+                prediction_date=prediction_date,
+                departure_time=prediction_data.get("departure_time", "09:00"),
+                arrival_time=prediction_data.get("arrival_time", "09:00"),
+                route_summary=f"Route to {point.name}",
+                route_details=prediction_data.get("route_details"),
+                total_walking_minutes=prediction_data.get("total_walking_minutes"),
+                total_walking_distance_km=prediction_data.get("total_walking_distance_km"),
+                calculated_at=datetime.now()
+            )
+            
+        except Exception as e:
+            logger.error(f"Error calculating prediction for point {point.id}: {e}")
+            return None
+
     def _get_next_friday_9am(self) -> date:
         """Get the next Friday at 9am date"""
-        from datetime import timedelta
-        
-        today = date.today()
-        days_ahead = 4 - today.weekday()  # Friday is 4 (Monday is 0)
-        
-        if days_ahead <= 0:  # Target day already happened this week
-            days_ahead += 7
-        
-        next_friday = today + timedelta(days=days_ahead)
-        return next_friday
+        return _next_friday(date.today())
 
     def _calculate_arrival_time(self, duration_seconds: int) -> str:
         """Calculate arrival time based on departure time (9am) and duration"""
@@ -311,5 +471,5 @@ class InterestPointsService:
 
     async def close(self):
         """Clean up resources"""
-        # This method is called by test scripts but doesn't need cleanup
-        pass 
\ No newline at end of file
+        if self.here_service is not None:
+            self.here_service.close() 
\ No newline at end of file
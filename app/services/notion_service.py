@@ -1,3 +1,4 @@
+import asyncio
 from typing import Optional, Dict, Any, List
 from notion_client import Client
 from app.models.property import Property, WebsiteListing, PropertyType, ListingStatus
@@ -5,6 +6,7 @@ from datetime import datetime
 from app.config import config
 from app.services.interest_points_service import InterestPointsService
 from app.models.interest_points import PropertyPredictionInfo
+from app.utils.formatting import format_km
 
 class NotionService:
     """Service for interacting with Notion API to save property data"""
@@ -395,25 +397,15 @@ class NotionService:
                         # Use route summary if available, otherwise use route_info (kept for future use)
                         route_display = prediction.route_summary if prediction.route_summary else route_info
                         
-                        # Format distance with one decimal place (unless less than 1km)
-                        distance_display = f"{prediction.distance_km:.1f}km" if prediction.distance_km >= 1.0 else f"{prediction.distance_km:.3f}km"
+                        distance_display = format_km(prediction.distance_km)
                         
                         # Add walking distance information if available
                         walking_info = ""
-                        if hasattr(prediction, 'total_walking_distance_km') and prediction.total_walking_distance_km > 0:
-                            walking_distance = prediction.total_walking_distance_km
-                            if walking_distance >= 1.0:
-                                walking_info = f" (🚶 {walking_distance:.1f}km walking)"
-                            else:
-                                walking_info = f" (🚶 {walking_distance:.3f}km walking)"
-                        elif prediction.route_details:
-                            # Fallback to route details for walking info
-                            total_walking = 0
-                            for section in prediction.route_details:
-                                if section.get("type") == "pedestrian":
-                                    total_walking += section.get("duration_minutes", 0)
-                            if total_walking > 0:
-                                walking_info = f" (🚶 {total_walking}min walking)"
+                        if prediction.total_walking_distance_km:
+                            walking_info = f" (🚶 {format_km(prediction.total_walking_distance_km)} walking)"
+                        elif prediction.total_walking_minutes:
+                            # Fallback to walking time for walking info
+                            walking_info = f" (🚶 {prediction.total_walking_minutes}min walking)"
                         
                         # Summary bullet per destination
                         prediction_text = (
@@ -489,8 +481,7 @@ class NotionService:
                                     }
                                     
                                     mode_emoji = mode_emojis.get(mode, "🚌")
-                                    distance_km = distance_m / 1000
-                                    distance_display = f"{distance_km:.1f}km" if distance_km >= 1.0 else f"{distance_km:.3f}km"
+                                    distance_display = format_km(distance_m / 1000)
                                     
                                     if line and line != "Unknown":
                                         section_text = f"  {i}. {mode_emoji} {line} ({duration}min, {distance_display})"
@@ -498,8 +489,7 @@ class NotionService:
                                         section_text = f"  {i}. {mode_emoji} {name} ({duration}min, {distance_display})"
                                         
                                 elif section_type == "pedestrian":
-                                    distance_km = distance_m / 1000
-                                    distance_display = f"{distance_km:.1f}km" if distance_km >= 1.0 else f"{distance_km:.3f}km"
+                                    distance_display = format_km(distance_m / 1000)
                                     section_text = f"  {i}. 🚶 Walking ({duration}min, {distance_display})"
                                     
                                 else:
@@ -647,7 +637,8 @@ class NotionService:
         """
         try:
             page_data = self._create_property_page_data(property_obj, prediction_info)
-            response = self.client.pages.create(**page_data)
+            # The Notion client is blocking, so keep it off the event loop
+            response = await asyncio.to_thread(self.client.pages.create, **page_data)
             
             return {
                 "success": True,
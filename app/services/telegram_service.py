@@ -1,9 +1,13 @@
+import asyncio
 import logging
 import re
-from typing import Optional, Dict, Any, List
+import traceback
+from functools import cached_property
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Sequence, Tuple, Union
+from urllib.parse import urlparse
 from telegram import Update, Bot
+from telegram.error import BadRequest
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
-from pydantic import HttpUrl, ValidationError
 
 from app.config import config
 from app.services.notion_service import NotionService
@@ -12,6 +16,8 @@ from app.services.interest_points_service import InterestPointsService
 from app.services.geocoding_service import GeocodingService
 from app.scrapers.scraper_factory import ScraperFactory
 from app.models.property import Property
+from app.models.interest_points import TransportationMode
+from app.utils.formatting import format_km
 
 # Configure logging
 logging.basicConfig(
@@ -20,6 +26,111 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Telegram clients split pasted text longer than 4096 characters into several
+# messages. Chunks this long are buffered briefly so the pieces are processed
+# as one message; a shorter follow-up chunk flushes the buffer sooner.
+_LONG_MESSAGE_THRESHOLD = 4000
+_LONG_MESSAGE_FLUSH_DELAY = 2.0
+_CONTINUATION_FLUSH_DELAY = 0.6
+
+# Emojis keyed by TransportationMode
+_TRANSPORT_EMOJIS = {
+    TransportationMode.DRIVING: "🚗",
+    TransportationMode.WALKING: "🚶",
+    TransportationMode.PUBLIC_TRANSPORT: "🚌",
+    TransportationMode.BICYCLING: "🚲",
+    TransportationMode.TRUCK: "🚛",
+    TransportationMode.TAXI: "🚕",
+    TransportationMode.BUS: "🚌",
+    TransportationMode.TRAIN: "🚆",
+    TransportationMode.SUBWAY: "🚇",
+    TransportationMode.TRAM: "🚊",
+    TransportationMode.FERRY: "⛴️"
+}
+
+# Emojis keyed by HERE transit section mode
+_MODE_EMOJIS = {
+    "bus": "🚌",
+    "train": "🚆",
+    "subway": "🚇",
+    "tram": "🚊",
+    "ferry": "⛴️",
+    "lightRail": "🚊",
+    "cityTrain": "🚆",
+    "regionalTrain": "🚆",
+    "intercityTrain": "🚆"
+}
+
+# Concurrent follow-up sends per reply, kept well under Telegram's per-chat rate limit
+_SEND_CONCURRENCY = 3
+
+# Matches http(s) URLs in free text
+_URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+
+# Characters with special meaning in Telegram's (legacy) Markdown parse mode
+_MD_SPECIAL_RE = re.compile(r'([_*`\[])')
+
+# Chat types where replies are prefixed with the sender's username
+_GROUP_CHAT_TYPES = frozenset({'group', 'supergroup'})
+
+
+def _md_escape(text: Any) -> str:
+    """Escape a dynamic value for interpolation into a Markdown reply"""
+    return _MD_SPECIAL_RE.sub(r'\\\1', str(text))
+
+
+def _get_coords(property_data: Any) -> Optional[Tuple[float, float]]:
+    """Return (latitude, longitude) for a property, or None if either is missing"""
+    address = getattr(property_data, 'address', None)
+    if address is None:
+        return None
+    latitude = getattr(address, 'latitude', None)
+    longitude = getattr(address, 'longitude', None)
+    if latitude is None or longitude is None:
+        return None
+    return latitude, longitude
+
+
+def _iter_chunks(parts: Iterable[str], limit: int = 4000) -> Iterator[str]:
+    """
+    Greedily pack message parts into chunks of at most limit characters
+    
+    Parts are kept whole where possible; a part longer than the limit is split
+    at line breaks, and a single line longer than the limit is hard cut.
+    
+    Args:
+        parts: Message fragments in display order
+        limit: Maximum length per chunk
+        
+    Yields:
+        Non-empty chunks, stripped of surrounding whitespace
+    """
+    buf: List[str] = []
+    size = 0
+    for part in parts:
+        if len(part) <= limit:
+            pieces = (part,)
+        else:
+            pieces = (
+                line[i:i + limit]
+                for line in part.splitlines(keepends=True)
+                for i in range(0, len(line), limit)
+            )
+        for piece in pieces:
+            if buf and size + len(piece) > limit:
+                chunk = "".join(buf).strip()
+                if chunk:
+                    yield chunk
+                buf = []
+                size = 0
+            buf.append(piece)
+            size += len(piece)
+    
+    chunk = "".join(buf).strip()
+    if chunk:
+        yield chunk
+
+
 class TelegramService:
     """Service for handling Telegram bot interactions"""
     
@@ -53,56 +164,51 @@ class TelegramService:
         
         self.application: Optional[Application] = None
         self.is_running = False
+        
+        # Buffered chunks of long messages, keyed by (chat ID, sender ID)
+        self._pending_buffers: Dict[Tuple[int, Optional[int]], Tuple[List[str], Update, asyncio.TimerHandle]] = {}
+        self._flush_tasks: set[asyncio.Task] = set()
+    
+    @cached_property
+    def _supported_sites(self) -> Tuple[str, ...]:
+        """Supported website domains (the scraper set is fixed for the service lifetime)"""
+        return tuple(self.scraper_factory.get_supported_websites())
+    
+    @cached_property
+    def _supported_csv(self) -> str:
+        """Supported website domains as a comma-separated string"""
+        return ", ".join(self._supported_sites)
+    
+    @cached_property
+    def _supported_bullets(self) -> str:
+        """Supported website domains as a bulleted list"""
+        return "\n".join(f"• {site}" for site in self._supported_sites)
     
     def _is_url(self, text: str) -> bool:
         """Check if text contains a valid URL"""
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-        return bool(re.search(url_pattern, text))
+        return _URL_RE.search(text) is not None
     
     def _extract_urls(self, text: str) -> list[str]:
         """Extract all URLs from text"""
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-        return re.findall(url_pattern, text)
+        return _URL_RE.findall(text)
     
-    def _split_message(self, message: str, max_length: int = 4000) -> List[str]:
+    def _split_message(self, message: Union[str, Sequence[str]], max_length: int = 4000) -> List[str]:
         """
         Split a long message into multiple parts that fit within Telegram's limits
         
         Args:
-            message: The message to split
+            message: The message to split, or its fragments in display order
             max_length: Maximum length per message (default 4000 to be safe)
             
         Returns:
             List of message parts
         """
-        if len(message) <= max_length:
-            return [message]
-        
-        parts = []
-        current_part = ""
-        lines = message.split('\n')
-        
-        for line in lines:
-            # If adding this line would exceed the limit
-            if len(current_part) + len(line) + 1 > max_length:
-                # Save current part if it's not empty
-                if current_part.strip():
-                    parts.append(current_part.strip())
-                
-                # Start new part with this line
-                current_part = line
-            else:
-                # Add line to current part
-                if current_part:
-                    current_part += '\n' + line
-                else:
-                    current_part = line
+        if isinstance(message, str):
+            if len(message) <= max_length:
+                return [message]
+            message = message.splitlines(keepends=True)
         
-        # Add the last part if it's not empty
-        if current_part.strip():
-            parts.append(current_part.strip())
-        
-        return parts
+        return list(_iter_chunks(message, max_length))
     
     async def _send_long_message(self, chat_id: int, message: str, parse_mode: str = None) -> List[Any]:
         """
@@ -120,6 +226,7 @@ class TelegramService:
             logger.error("Bot not initialized, cannot send message")
             return []
         
+        bot = self.application.bot
         parts = self._split_message(message)
         sent_messages = []
         
@@ -131,25 +238,76 @@ class TelegramService:
                     pass
                 else:
                     # Additional parts - send as new messages
-                    sent_msg = await self.application.bot.send_message(
+                    sent_msg = await bot.send_message(
                         chat_id=chat_id,
                         text=part,
                         parse_mode=parse_mode
                     )
                     sent_messages.append(sent_msg)
             except Exception as e:
-                logger.error(f"Failed to send message part {i+1}: {e}")
+                logger.error("Failed to send message part %d: %s", i + 1, e)
                 # Try to send without parse_mode if it fails
                 try:
-                    sent_msg = await self.application.bot.send_message(
+                    sent_msg = await bot.send_message(
                         chat_id=chat_id,
                         text=part
                     )
                     sent_messages.append(sent_msg)
                 except Exception as e2:
-                    logger.error(f"Failed to send message part {i+1} without parse_mode: {e2}")
+                    logger.error("Failed to send message part %d without parse_mode: %s", i + 1, e2)
         
         return sent_messages
+    
+    async def _send_chunks(self, update: Update, processing_msg: Any, parts: Iterable[str],
+                           preserve_order: bool = False) -> None:
+        """
+        Send a Markdown reply, editing the first chunk into the processing message
+        
+        Parts are packed into Telegram-sized chunks as they are consumed. Remaining
+        chunks are sent concurrently unless preserve_order is set, and any chunk
+        Telegram rejects as invalid Markdown is resent as plain text.
+        
+        Args:
+            update: The update being replied to
+            processing_msg: The processing message to edit the first chunk into
+            parts: Message fragments in display order
+            preserve_order: Send remaining chunks one at a time so they arrive in order
+        """
+        chunks = _iter_chunks(parts)
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            return
+        
+        edit_text = processing_msg.edit_text
+        try:
+            await edit_text(first_chunk, parse_mode='Markdown')
+        except BadRequest as e:
+            logger.warning("Failed to edit first message part as Markdown: %s", e)
+            await edit_text(first_chunk)
+        
+        reply_text = update.message.reply_text
+        semaphore = asyncio.Semaphore(_SEND_CONCURRENCY)
+        
+        async def send(chunk: str) -> None:
+            async with semaphore:
+                try:
+                    await reply_text(chunk, parse_mode='Markdown')
+                except BadRequest as e:
+                    logger.warning("Failed to send message part as Markdown: %s", e)
+                    await reply_text(chunk)
+        
+        if preserve_order:
+            for chunk in chunks:
+                try:
+                    await send(chunk)
+                except Exception as e:
+                    logger.error("Failed to send message part: %s", e)
+            return
+        
+        results = await asyncio.gather(*(send(chunk) for chunk in chunks), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Failed to send message part: %s", result)
 
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command"""
@@ -163,7 +321,7 @@ class TelegramService:
             "/supported - List supported property websites\n\n"
             "🔗 To add a property, simply send me a property URL from a supported website!\n\n"
             "Supported websites:\n"
-            f"• {', '.join(self.scraper_factory.get_supported_websites())}"
+            f"• {self._supported_csv}"
         )
         await update.message.reply_text(welcome_message)
     
@@ -176,7 +334,7 @@ class TelegramService:
             "2. I'll scrape the property details automatically\n"
             "3. The property will be saved to your Notion database\n\n"
             "🌐 Supported websites:\n"
-            f"• {', '.join(self.scraper_factory.get_supported_websites())}\n\n"
+            f"• {self._supported_csv}\n\n"
             "⚡ Commands:\n"
             "/start - Welcome message\n"
             "/help - This help message\n"
@@ -199,7 +357,7 @@ class TelegramService:
                     "✅ Notion Database: Connected\n"
                     f"📊 Database: {db_info.get('database_title', 'Unknown')}\n"
                     f"🔧 Available scrapers: {len(self.scraper_factory.scrapers)}\n"
-                    f"🌐 Supported sites: {', '.join(self.scraper_factory.get_supported_websites())}"
+                    f"🌐 Supported sites: {self._supported_csv}"
                 )
             else:
                 status_message = (
@@ -218,12 +376,10 @@ class TelegramService:
     
     async def supported_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /supported command"""
-        supported_sites = self.scraper_factory.get_supported_websites()
-        
         message = (
             "🌐 Supported Property Websites:\n\n"
-            + "\n".join([f"• {site}" for site in supported_sites])
-            + f"\n\nTotal: {len(supported_sites)} website(s) supported"
+            f"{self._supported_bullets}\n\n"
+            f"Total: {len(self._supported_sites)} website(s) supported"
         )
         
         await update.message.reply_text(message)
@@ -242,19 +398,14 @@ class TelegramService:
             )
             return
         
-        # Check if the replied message contains property information
-        replied_text = update.message.reply_to_message.text
-        if "Property saved successfully" not in replied_text:
+        # Check the replied message is a saved property and extract its URL in one pass;
+        # the regex runs first so unrelated replies without a URL fail fastest
+        replied_text = update.message.reply_to_message.text or ""
+        url_match = _URL_RE.search(replied_text)
+        if not url_match or "Property saved successfully" not in replied_text:
             await update.message.reply_text(
-                "❌ Please reply to a property message (one that shows 'Property saved successfully') to see detailed predictions."
-            )
-            return
-        
-        # Extract the property URL from the replied message
-        url_match = re.search(r'https?://[^\s<>"{}|\\^`\[\]]+', replied_text)
-        if not url_match:
-            await update.message.reply_text(
-                "❌ Could not find the property URL in the replied message."
+                "❌ Please reply to a property message (one that shows 'Property saved successfully' "
+                "and the listing URL) to see detailed predictions."
             )
             return
         
@@ -264,80 +415,65 @@ class TelegramService:
         processing_msg = await update.message.reply_text(
             "🔄 Calculating detailed prediction times..."
         )
+        edit_text = processing_msg.edit_text
         
         try:
             # Get the property from the database
             property_data = await self.property_service.get_property_by_url(property_url)
             if not property_data:
-                await processing_msg.edit_text(
+                await edit_text(
                     "❌ Property not found in database. Please try processing the property URL again."
                 )
                 return
             
             # Check if property has coordinates
-            if not (hasattr(property_data, 'address') and 
-                   hasattr(property_data.address, 'latitude') and 
-                   hasattr(property_data.address, 'longitude') and
-                   property_data.address.latitude is not None and 
-                   property_data.address.longitude is not None):
-                await processing_msg.edit_text(
+            coords = _get_coords(property_data)
+            if coords is None:
+                await edit_text(
                     "❌ Property coordinates not available. Cannot calculate travel times."
                 )
                 return
             
             # Calculate predictions
+            latitude, longitude = coords
             property_address = f"{property_data.address.city}, {property_data.address.county or ''}"
             prediction_info = await self.interest_points_service.calculate_predictions_for_property(
-                property_data.address.latitude,
-                property_data.address.longitude,
+                latitude,
+                longitude,
                 property_address
             )
             
-            if not prediction_info or not prediction_info.predictions:
-                await processing_msg.edit_text(
+            predictions = getattr(prediction_info, 'predictions', None) or ()
+            if not predictions:
+                await edit_text(
                     "❌ No prediction data available for this property."
                 )
                 return
             
             # Build detailed message
-            detailed_message = (
+            message_parts: List[str] = [
                 f"🚗 **Detailed Travel Times for Next Friday 9am**\n"
-                f"📍 **Property**: {property_data.address.city}, {property_data.address.county or ''}\n\n"
-            )
+                f"📍 **Property**: {_md_escape(property_data.address.city)}, {_md_escape(property_data.address.county or '')}\n\n"
+            ]
             
-            for i, prediction in enumerate(prediction_info.predictions, 1):
+            for i, prediction in enumerate(predictions, 1):
                 point_name = prediction.destination_point_id
                 interest_point = self.interest_points_service.get_interest_point_by_id(prediction.destination_point_id)
                 if interest_point:
                     point_name = interest_point.name
                 
-                # Transportation mode emojis
-                transport_emojis = {
-                    "DRIVING": "🚗",
-                    "WALKING": "🚶",
-                    "PUBLIC_TRANSPORT": "🚌",
-                    "BICYCLING": "🚲",
-                    "TRUCK": "🚛",
-                    "TAXI": "🚕",
-                    "BUS": "🚌",
-                    "TRAIN": "🚆",
-                    "SUBWAY": "🚇",
-                    "TRAM": "🚊",
-                    "FERRY": "⛴️"
-                }
-                
-                transport_emoji = transport_emojis.get(prediction.transportation_mode.value.upper(), "🚗")
-                distance_display = f"{prediction.distance_km:.1f}km" if prediction.distance_km >= 1.0 else f"{prediction.distance_km:.3f}km"
+                transport_emoji = _TRANSPORT_EMOJIS.get(prediction.transportation_mode, "🚗")
+                distance_display = format_km(prediction.distance_km)
                 
-                detailed_message += (
-                    f"**{i}. {transport_emoji} {point_name}**\n"
+                message_parts.append(
+                    f"**{i}. {transport_emoji} {_md_escape(point_name)}**\n"
                     f"⏱️ {prediction.duration_minutes}min • 📏 {distance_display}\n"
                     f"🕐 Depart: {prediction.departure_time} • Arrive: {prediction.arrival_time}\n\n"
                 )
                 
                 # Add detailed route breakdown
                 if prediction.route_details and len(prediction.route_details) > 0:
-                    detailed_message += "**Route Details:**\n"
+                    message_parts.append("**Route Details:**\n")
                     
                     for j, section in enumerate(prediction.route_details, 1):
                         section_type = section.get("type", "unknown")
@@ -349,34 +485,20 @@ class TelegramService:
                             name = section.get("name", "Unknown")
                             line = section.get("line", "")
                             
-                            mode_emojis = {
-                                "bus": "🚌",
-                                "train": "🚆", 
-                                "subway": "🚇",
-                                "tram": "🚊",
-                                "ferry": "⛴️",
-                                "lightRail": "🚊",
-                                "cityTrain": "🚆",
-                                "regionalTrain": "🚆",
-                                "intercityTrain": "🚆"
-                            }
-                            
-                            mode_emoji = mode_emojis.get(mode, "🚌")
-                            distance_km = distance_m / 1000
-                            distance_display = f"{distance_km:.1f}km" if distance_km >= 1.0 else f"{distance_km:.3f}km"
+                            mode_emoji = _MODE_EMOJIS.get(mode, "🚌")
+                            distance_display = format_km(distance_m / 1000)
                             
                             if line and line != "Unknown":
-                                detailed_message += f"  {j}. {mode_emoji} **{line}** ({duration}min, {distance_display})\n"
+                                message_parts.append(f"  {j}. {mode_emoji} **{_md_escape(line)}** ({duration}min, {distance_display})\n")
                             else:
-                                detailed_message += f"  {j}. {mode_emoji} **{name}** ({duration}min, {distance_display})\n"
+                                message_parts.append(f"  {j}. {mode_emoji} **{_md_escape(name)}** ({duration}min, {distance_display})\n")
                                 
                         elif section_type == "pedestrian":
-                            distance_km = distance_m / 1000
-                            distance_display = f"{distance_km:.1f}km" if distance_km >= 1.0 else f"{distance_km:.3f}km"
-                            detailed_message += f"  {j}. 🚶 **Walking** ({duration}min, {distance_display})\n"
+                            distance_display = format_km(distance_m / 1000)
+                            message_parts.append(f"  {j}. 🚶 **Walking** ({duration}min, {distance_display})\n")
                             
                         else:
-                            detailed_message += f"  {j}. **{section_type.title()}** ({duration}min)\n"
+                            message_parts.append(f"  {j}. **{_md_escape(section_type.title())}** ({duration}min)\n")
                     
                     # Add summary
                     num_legs = len(prediction.route_details)
@@ -392,71 +514,96 @@ class TelegramService:
                     if walking_legs > 0:
                         summary_parts.append(f"🚶 {walking_legs} walking")
                     
-                    detailed_message += f"📊 **Summary**: {num_legs} legs • {' + '.join(summary_parts)}\n"
-                    detailed_message += f"⏱️ **Total**: {total_transit}min transit + {total_walking}min walking\n\n"
+                    message_parts.append(
+                        f"📊 **Summary**: {num_legs} legs • {' + '.join(summary_parts)}\n"
+                        f"⏱️ **Total**: {total_transit}min transit + {total_walking}min walking\n\n"
+                    )
                 
-                detailed_message += "─" * 40 + "\n\n"
+                message_parts.append(f"{'─' * 40}\n\n")
             
-            # Check if message is too long and split if necessary
-            if len(detailed_message) > 4000:
-                parts = self._split_message(detailed_message)
-                
-                # Edit the first part into the processing message
-                try:
-                    await processing_msg.edit_text(parts[0], parse_mode='Markdown')
-                except Exception as e:
-                    logger.warning(f"Failed to edit first detailed message part: {e}")
-                    await update.message.reply_text(parts[0], parse_mode='Markdown')
-                
-                # Send remaining parts as new messages
-                for part in parts[1:]:
-                    try:
-                        await update.message.reply_text(part, parse_mode='Markdown')
-                    except Exception as e:
-                        logger.warning(f"Failed to send detailed message part: {e}")
-                        try:
-                            await update.message.reply_text(part)
-                        except Exception as e2:
-                            logger.error(f"Failed to send detailed message part without parse_mode: {e2}")
-            else:
-                await processing_msg.edit_text(detailed_message, parse_mode='Markdown')
+            # The detailed breakdown reads top to bottom, so keep its parts in order
+            await self._send_chunks(update, processing_msg, message_parts, preserve_order=True)
                 
         except Exception as e:
-            await processing_msg.edit_text(
+            await edit_text(
                 f"❌ Error calculating detailed predictions: {str(e)}"
             )
-            logger.error(f"Error in predictions command: {e}")
+            logger.error("Error in predictions command: %s", e)
     
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle incoming messages"""
         message_text = update.message.text
+        sender = update.effective_user
+        buffer_key = (update.effective_chat.id, sender.id if sender else None)
+        
+        # Buffer long messages (and their continuations) that Telegram split client-side
+        if buffer_key in self._pending_buffers or len(message_text) >= _LONG_MESSAGE_THRESHOLD:
+            self._buffer_message_chunk(buffer_key, update, message_text)
+            return
+        
+        await self._process_message_text(update, message_text)
+    
+    def _buffer_message_chunk(self, buffer_key: Tuple[int, Optional[int]], update: Update, message_text: str) -> None:
+        """Add a message chunk to the sender's buffer and (re)schedule its flush"""
+        chunks: List[str] = []
+        pending = self._pending_buffers.pop(buffer_key, None)
+        if pending:
+            chunks, update, timer = pending
+            timer.cancel()
+        
+        chunks.append(message_text)
+        
+        # Another chunk is likely to follow a full-length one, so wait longer
+        if len(message_text) >= _LONG_MESSAGE_THRESHOLD:
+            delay = _LONG_MESSAGE_FLUSH_DELAY
+        else:
+            delay = _CONTINUATION_FLUSH_DELAY
+        
+        timer = asyncio.get_running_loop().call_later(delay, self._schedule_flush, buffer_key)
+        self._pending_buffers[buffer_key] = (chunks, update, timer)
+    
+    def _schedule_flush(self, buffer_key: Tuple[int, Optional[int]]) -> None:
+        """Start flushing a sender's buffer from the event loop timer"""
+        task = asyncio.create_task(self._flush_pending_buffer(buffer_key))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+    
+    async def _flush_pending_buffer(self, buffer_key: Tuple[int, Optional[int]]) -> None:
+        """Process the buffered chunks of a sender as a single message"""
+        pending = self._pending_buffers.pop(buffer_key, None)
+        if not pending:
+            return
+        
+        chunks, update, _ = pending
+        try:
+            await self._process_message_text(update, "".join(chunks))
+        except Exception as e:
+            logger.error("Error processing buffered message for chat %s, user %s: %s", *buffer_key, e)
+    
+    async def _process_message_text(self, update: Update, message_text: str) -> None:
+        """Extract and process the property URLs in a message"""
         user_id = update.effective_user.id
         username = update.effective_user.username or update.effective_user.first_name
         
         # Check if this is a group chat
         chat_type = update.effective_chat.type
-        is_group_chat = chat_type in ['group', 'supergroup']
+        # Add username prefix for group chats
+        username_prefix = f"👤 @{username}: " if chat_type in _GROUP_CHAT_TYPES else ""
         
-        logger.info(f"Received message from user {username} ({user_id}) in {chat_type}: {message_text}")
+        logger.info("Received message from user %s (%s) in %s: %s", username, user_id, chat_type, message_text)
         
         # Check if message contains URLs
         if not self._is_url(message_text):
-            # Add username prefix for group chats
-            username_prefix = f"👤 @{username}: " if is_group_chat else ""
-            
             await update.message.reply_text(
                 f"{username_prefix}🤔 I don't see any URLs in your message.\n\n"
                 "Please send me a property URL from a supported website, or use /help for more information."
             )
             return
         
-        # Extract URLs from message
-        urls = self._extract_urls(message_text)
+        # Extract URLs from message, dropping repeats (common in forwards) but keeping order
+        urls = list(dict.fromkeys(self._extract_urls(message_text)))
         
         if not urls:
-            # Add username prefix for group chats
-            username_prefix = f"👤 @{username}: " if is_group_chat else ""
-            
             await update.message.reply_text(
                 f"{username_prefix}🤔 I couldn't extract any valid URLs from your message.\n\n"
                 "Please make sure the URL is complete and try again."
@@ -469,73 +616,72 @@ class TelegramService:
             await self._process_property_url(update, urls[0], username)
         else:
             # Multiple URLs - send a summary and process each one
-            username_prefix = f"👤 @{username}: " if is_group_chat else ""
-            
             summary_msg = await update.message.reply_text(
                 f"{username_prefix}🔗 Found {len(urls)} URLs in your message. Processing each one..."
             )
+            edit_summary = summary_msg.edit_text
             
             for i, url_str in enumerate(urls, 1):
-                await summary_msg.edit_text(
+                await edit_summary(
                     f"🔗 Processing URL {i}/{len(urls)}...\n📍 {url_str}"
                 )
                 await self._process_property_url(update, url_str, username)
             
             # Final summary
-            await summary_msg.edit_text(
+            await edit_summary(
                 f"{username_prefix}✅ Finished processing {len(urls)} URLs from your message!"
             )
     
     async def _process_property_url(self, update: Update, url_str: str, username: str) -> None:
         """Process a single property URL"""
+        # Add username prefix for group chats
+        username_prefix = f"👤 @{username}: " if update.effective_chat.type in _GROUP_CHAT_TYPES else ""
+        reply_text = update.message.reply_text
+        
         try:
-            # Validate URL
-            try:
-                url = HttpUrl(url_str)
-            except ValidationError:
-                username_prefix = f"👤 @{username}: " if update.effective_chat.type in ['group', 'supergroup'] else ""
-                await update.message.reply_text(f"{username_prefix}❌ Invalid URL format: {url_str}")
+            # Validate URL (a cheap scheme/host check; the listing model validates it fully)
+            parsed_url = urlparse(url_str)
+            if parsed_url.scheme not in ('http', 'https') or not parsed_url.netloc:
+                await reply_text(f"{username_prefix}❌ Invalid URL format: {url_str}")
                 return
             
             # Send initial processing message as a reply to the original message
-            processing_msg = await update.message.reply_text(
+            processing_msg = await reply_text(
                 f"🔄 Processing property URL...\n📍 {url_str}"
             )
+            edit_text = processing_msg.edit_text
             
             # Check if scraper exists for this URL
-            scraper = self.scraper_factory.get_scraper_for_url(url)
+            scraper = self.scraper_factory.get_scraper_for_url(url_str)
             if not scraper:
-                supported_sites = self.scraper_factory.get_supported_websites()
-                username_prefix = f"👤 @{username}: " if update.effective_chat.type in ['group', 'supergroup'] else ""
-                await processing_msg.edit_text(
+                await edit_text(
                     f"{username_prefix}❌ Unsupported website\n\n"
-                    f"🌐 Supported sites: {', '.join(supported_sites)}"
+                    f"🌐 Supported sites: {self._supported_csv}"
                 )
                 return
             
             # Scrape the property
-            await processing_msg.edit_text(
+            await edit_text(
                 f"🔄 Scraping property data...\n📍 {url_str}"
             )
             
-            property_data = await self.scraper_factory.scrape_property(url)
+            property_data = await self.scraper_factory.scrape_property(url_str)
             if not property_data:
-                username_prefix = f"👤 @{username}: " if update.effective_chat.type in ['group', 'supergroup'] else ""
-                await processing_msg.edit_text(
+                await edit_text(
                     f"{username_prefix}❌ Failed to scrape property data\n📍 {url_str}\n\n"
                     "The property page might be unavailable or the structure has changed."
                 )
                 return
             
             # Save to property service
-            await processing_msg.edit_text(
+            await edit_text(
                 f"💾 Saving property data...\n📍 {url_str}"
             )
             
             saved_property = await self.property_service.create_property(property_data)
             
             # Calculate prediction times for next Friday at 9am BEFORE saving to Notion
-            await processing_msg.edit_text(
+            await edit_text(
                 f"🚗 Calculating prediction times for next Friday 9am...\n📍 {url_str}"
             )
             
@@ -546,17 +692,13 @@ class TelegramService:
                 latitude = None
                 longitude = None
                 
-                logger.info(f"Checking coordinates for property: {property_data.address if hasattr(property_data, 'address') else 'No address'}")
+                logger.info("Checking coordinates for property: %s", getattr(property_data, 'address', 'No address'))
                 
-                if (hasattr(property_data, 'address') and 
-                    hasattr(property_data.address, 'latitude') and 
-                    hasattr(property_data.address, 'longitude') and
-                    property_data.address.latitude is not None and 
-                    property_data.address.longitude is not None):
+                coords = _get_coords(property_data)
+                if coords is not None:
                     has_coordinates = True
-                    latitude = property_data.address.latitude
-                    longitude = property_data.address.longitude
-                    logger.info(f"Property has coordinates from scraper: {latitude}, {longitude}")
+                    latitude, longitude = coords
+                    logger.info("Property has coordinates from scraper: %s, %s", latitude, longitude)
                 else:
                     logger.info("Property coordinates not available from scraper, attempting geocoding...")
                     
@@ -566,7 +708,7 @@ class TelegramService:
                         if geocoded_coords:
                             has_coordinates = True
                             latitude, longitude = geocoded_coords
-                            logger.info(f"Property coordinates obtained via geocoding: {latitude}, {longitude}")
+                            logger.info("Property coordinates obtained via geocoding: %s, %s", latitude, longitude)
                             
                             # Update the property address with the geocoded coordinates
                             property_data.address.latitude = latitude
@@ -583,17 +725,16 @@ class TelegramService:
                         longitude,
                         property_address
                     )
-                    logger.info(f"Prediction info calculated: {len(prediction_info.predictions) if prediction_info else 0} predictions")
+                    logger.info("Prediction info calculated: %d predictions", len(prediction_info.predictions) if prediction_info else 0)
                 else:
                     logger.info("No coordinates available, skipping prediction times")
                     
             except Exception as e:
-                logger.warning(f"Failed to calculate prediction times: {e}")
-                import traceback
-                logger.warning(f"Traceback: {traceback.format_exc()}")
+                logger.warning("Failed to calculate prediction times: %s", e)
+                logger.warning("Traceback: %s", traceback.format_exc())
             
             # Save to Notion (pass predictions so the Transportation section is included)
-            await processing_msg.edit_text(
+            await edit_text(
                 f"📝 Saving to Notion database...\n📍 {url_str}"
             )
             
@@ -601,177 +742,88 @@ class TelegramService:
             
             # Send success/failure message
             if notion_result.get("success"):
-                # Add username prefix for group chats
-                username_prefix = f"👤 @{username}: " if update.effective_chat.type in ['group', 'supergroup'] else ""
-                
                 # Build concise success message
-                success_message = (
-                    f"{username_prefix}✅ Property saved successfully!\n\n"
+                message_parts: List[str] = [
+                    f"{_md_escape(username_prefix)}✅ Property saved successfully!\n\n"
                     f"🏠 {property_data.property_type.value.title()}\n"
-                    f"📍 {property_data.address.city}, {property_data.address.county or ''}\n"
+                    f"📍 {_md_escape(property_data.address.city)}, {_md_escape(property_data.address.county or '')}\n"
                     f"🛏️ {property_data.bedrooms} bed, {property_data.bathrooms} bath\n"
                     f"📐 {property_data.area_sqm}m²\n"
-                    f"💰 {property_data.primary_listing.price if property_data.primary_listing else 'N/A'}\n\n"
-                )
+                    f"💰 {_md_escape(property_data.primary_listing.price if property_data.primary_listing else 'N/A')}\n\n"
+                ]
                 
                 # Add prediction times if available
-                if prediction_info and prediction_info.predictions and len(prediction_info.predictions) > 0:
-                    success_message += f"🚗 **Next Friday 9am Predictions:**\n"
+                predictions = getattr(prediction_info, 'predictions', None) or ()
+                if predictions:
+                    message_parts.append("🚗 **Next Friday 9am Predictions:**\n")
                     
                     # Show all predictions to display all interest points
-                    for i, prediction in enumerate(prediction_info.predictions):
+                    for i, prediction in enumerate(predictions):
                         point_name = prediction.destination_point_id
                         # Try to get the actual point name
                         interest_point = self.interest_points_service.get_interest_point_by_id(prediction.destination_point_id)
                         if interest_point:
                             point_name = interest_point.name
                         
-                        # Transportation mode emojis
-                        transport_emojis = {
-                            "DRIVING": "🚗",
-                            "WALKING": "🚶",
-                            "PUBLIC_TRANSPORT": "🚌",
-                            "BICYCLING": "🚲",
-                            "TRUCK": "🚛",
-                            "TAXI": "🚕",
-                            "BUS": "🚌",
-                            "TRAIN": "🚆",
-                            "SUBWAY": "🚇",
-                            "TRAM": "🚊",
-                            "FERRY": "⛴️"
-                        }
+                        # First transit section, used to pick a more specific emoji
+                        first_transit = next(
+                            (section for section in prediction.route_details or () if section.get("type") == "transit"),
+                            None
+                        )
                         
                         # Get the appropriate emoji for the transportation mode
-                        transport_emoji = transport_emojis.get(prediction.transportation_mode.value.upper(), "🚗")
+                        transport_emoji = _TRANSPORT_EMOJIS.get(prediction.transportation_mode, "🚗")
                         
-                        # For public transport, use a more specific emoji based on the route details
-                        if prediction.transportation_mode.value == "publicTransport" and prediction.route_details:
-                            # Check if we have transit sections to determine the primary mode
-                            transit_sections = [s for s in prediction.route_details if s.get("type") == "transit"]
-                            if transit_sections:
-                                primary_mode = transit_sections[0].get("mode", "bus")
-                                mode_emojis = {
-                                    "bus": "🚌",
-                                    "train": "🚆", 
-                                    "subway": "🚇",
-                                    "tram": "🚊",
-                                    "ferry": "⛴️",
-                                    "lightRail": "🚊",
-                                    "cityTrain": "🚆",
-                                    "regionalTrain": "🚆",
-                                    "intercityTrain": "🚆"
-                                }
-                                transport_emoji = mode_emojis.get(primary_mode, "🚌")
+                        # For public transport, use a more specific emoji based on the first transit section
+                        if prediction.transportation_mode is TransportationMode.PUBLIC_TRANSPORT and first_transit:
+                            primary_mode = first_transit.get("mode", "bus")
+                            transport_emoji = _MODE_EMOJIS.get(primary_mode, "🚌")
                         
                         # Format distance with one decimal place (unless less than 1km)
-                        distance_display = f"{prediction.distance_km:.1f}km" if prediction.distance_km >= 1.0 else f"{prediction.distance_km:.3f}km"
+                        distance_display = format_km(prediction.distance_km)
                         
                         # Add walking distance information if available
                         walking_info = ""
-                        if hasattr(prediction, 'total_walking_distance_km') and prediction.total_walking_distance_km > 0:
-                            walking_distance = prediction.total_walking_distance_km
-                            if walking_distance >= 1.0:
-                                walking_info = f" (🚶 {walking_distance:.1f}km walking)"
-                            else:
-                                walking_info = f" (🚶 {walking_distance:.3f}km walking)"
-                        elif prediction.route_details:
-                            # Fallback to route details for walking info
-                            total_walking = 0
-                            for section in prediction.route_details:
-                                if section.get("type") == "pedestrian":
-                                    total_walking += section.get("duration_minutes", 0)
-                            if total_walking > 0:
-                                walking_info = f" (🚶 {total_walking}min walking)"
+                        if prediction.total_walking_distance_km:
+                            walking_info = f" (🚶 {format_km(prediction.total_walking_distance_km)} walking)"
+                        elif prediction.total_walking_minutes:
+                            # Fallback to walking time for walking info
+                            walking_info = f" (🚶 {prediction.total_walking_minutes}min walking)"
                         
-                        success_message += (
-                            f"• {transport_emoji} **{point_name}**: "
+                        message_parts.append(
+                            f"• {transport_emoji} **{_md_escape(point_name)}**: "
                             f"{prediction.duration_minutes}min ({distance_display}){walking_info}\n"
                             f"  Depart: {prediction.departure_time} • Arrive: {prediction.arrival_time}\n"
                         )
                     
-
-                    
-                    success_message += "\n"
+                    message_parts.append("\n")
                 
                 elif not has_coordinates:
-                    success_message += "⚠️ *Prediction times not available* - Property coordinates not found\n\n"
+                    message_parts.append("⚠️ *Prediction times not available* - Property coordinates not found\n\n")
                 else:
                     # Coordinates are available but predictions failed or are empty
-                    success_message += "⚠️ *Prediction times not available* - Unable to calculate travel times (HERE API error)\n\n"
+                    message_parts.append("⚠️ *Prediction times not available* - Unable to calculate travel times (HERE API error)\n\n")
                 
-                success_message += (
+                message_parts.append(
                     f"📋 [View in Notion]({notion_result.get('notion_page_url', '#')})\n"
                     f"🔗 [Original listing]({url_str})"
                 )
+                await self._send_chunks(update, processing_msg, message_parts)
                 
-                # Check if message is too long and split if necessary
-                if len(success_message) > 4000:
-                    # Split the message and send as multiple messages
-                    parts = self._split_message(success_message)
-                    
-                    # Edit the first part into the existing processing message
-                    try:
-                        await processing_msg.edit_text(parts[0], parse_mode='Markdown')
-                    except Exception as e:
-                        logger.warning(f"Failed to edit first message part: {e}")
-                        # If editing fails, send as new message
-                        await update.message.reply_text(parts[0], parse_mode='Markdown')
-                    
-                    # Send remaining parts as new messages
-                    for part in parts[1:]:
-                        try:
-                            await update.message.reply_text(part, parse_mode='Markdown')
-                        except Exception as e:
-                            logger.warning(f"Failed to send message part: {e}")
-                            # Try without parse_mode if it fails
-                            try:
-                                await update.message.reply_text(part)
-                            except Exception as e2:
-                                logger.error(f"Failed to send message part without parse_mode: {e2}")
-                else:
-                    # Message is short enough, just edit the existing message
-                    await processing_msg.edit_text(success_message, parse_mode='Markdown')
-                
-                logger.info(f"Successfully processed property for user {username}: {url_str}")
+                logger.info("Successfully processed property for user %s: %s", username, url_str)
             else:
-                # Add username prefix for group chats
-                username_prefix = f"👤 @{username}: " if update.effective_chat.type in ['group', 'supergroup'] else ""
-                
                 error_message = (
-                    f"{username_prefix}⚠️ Property scraped but failed to save to Notion\n\n"
+                    f"{_md_escape(username_prefix)}⚠️ Property scraped but failed to save to Notion\n\n"
                     f"🏠 {property_data.property_type.value.title()}\n"
-                    f"📍 {property_data.address.city}\n\n"
-                    f"❌ Notion error: {notion_result.get('error', 'Unknown error')}\n"
+                    f"📍 {_md_escape(property_data.address.city)}\n\n"
+                    f"❌ Notion error: {_md_escape(notion_result.get('error', 'Unknown error'))}\n"
                     f"🔗 [Original listing]({url_str})"
                 )
-                # Check if error message is too long and split if necessary
-                if len(error_message) > 4000:
-                    parts = self._split_message(error_message)
-                    
-                    # Edit the first part into the existing processing message
-                    try:
-                        await processing_msg.edit_text(parts[0], parse_mode='Markdown')
-                    except Exception as e:
-                        logger.warning(f"Failed to edit first error message part: {e}")
-                        await update.message.reply_text(parts[0], parse_mode='Markdown')
-                    
-                    # Send remaining parts as new messages
-                    for part in parts[1:]:
-                        try:
-                            await update.message.reply_text(part, parse_mode='Markdown')
-                        except Exception as e:
-                            logger.warning(f"Failed to send error message part: {e}")
-                            try:
-                                await update.message.reply_text(part)
-                            except Exception as e2:
-                                logger.error(f"Failed to send error message part without parse_mode: {e2}")
-                else:
-                    await processing_msg.edit_text(error_message, parse_mode='Markdown')
+                await self._send_chunks(update, processing_msg, (error_message,))
                 
-                logger.error(f"Failed to save to Notion for user {username}: {notion_result.get('error')}")
+                logger.error("Failed to save to Notion for user %s: %s", username, notion_result.get('error'))
                 
         except Exception as e:
-            username_prefix = f"👤 @{username}: " if update.effective_chat.type in ['group', 'supergroup'] else ""
             error_message = (
                 f"{username_prefix}❌ Error processing property\n📍 {url_str}\n\n"
                 f"Error: {str(e)}"
@@ -779,13 +831,13 @@ class TelegramService:
             try:
                 await processing_msg.edit_text(error_message)
             except:
-                await update.message.reply_text(error_message)
+                await reply_text(error_message)
             
-            logger.error(f"Error processing property for user {username}: {str(e)}")
+            logger.error("Error processing property for user %s: %s", username, e)
     
     async def error_handler(self, update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle errors"""
-        logger.error(f"Exception while handling an update: {context.error}")
+        logger.error("Exception while handling an update: %s", context.error)
         
         if isinstance(update, Update) and update.message:
             await update.message.reply_text(
@@ -832,7 +884,7 @@ class TelegramService:
             logger.info("Telegram bot started successfully")
             
         except Exception as e:
-            logger.error(f"Failed to start Telegram bot: {str(e)}")
+            logger.error("Failed to start Telegram bot: %s", e)
             raise
     
     async def stop_bot(self) -> None:
@@ -841,6 +893,15 @@ class TelegramService:
             logger.warning("Bot is not running")
             return
         
+        # Drop any buffered message chunks that have not been flushed yet and
+        # cancel flushes already in progress, so nothing is processed after stopping
+        for _, _, timer in self._pending_buffers.values():
+            timer.cancel()
+        self._pending_buffers.clear()
+        for task in self._flush_tasks:
+            task.cancel()
+        await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        
         try:
             await self.application.updater.stop()
             await self.application.stop()
@@ -850,7 +911,7 @@ class TelegramService:
             logger.info("Telegram bot stopped successfully")
             
         except Exception as e:
-            logger.error(f"Error stopping Telegram bot: {str(e)}")
+            logger.error("Error stopping Telegram bot: %s", e)
             raise
     
     def get_bot_info(self) -> Dict[str, Any]:
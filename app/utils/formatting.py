@@ -0,0 +1,3 @@
+def format_km(km: float) -> str:
+    """Format a distance in km (one decimal place, or three below 1km)"""
+    return f"{km:.1f}km" if km >= 1.0 else f"{km:.3f}km"
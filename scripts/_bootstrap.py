@@ -0,0 +1,10 @@
+"""
+Put the repository root on sys.path so standalone scripts can import the app package
+"""
+
+import sys
+from pathlib import Path
+
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
@@ -0,0 +1,48 @@
+"""
+Opt-in on-disk cache of HERE probe responses for repeated local runs
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+# Cache directory, relative to the working directory like .pytest_cache
+_CACHE_DIR = Path(".here_cache")
+
+# Cached responses older than this are fetched again
+_CACHE_TTL_SECONDS = 3600
+
+
+def cache_enabled():
+    """Caching is off by default so a probe always checks the live API"""
+    return os.getenv("HERE_PROBE_CACHE", "false").lower() == "true"
+
+
+def _cache_path(url, params):
+    """Cache file for a request, keyed on URL and params without the API key"""
+    key_params = sorted((k, str(v)) for k, v in params.items() if k != "apiKey")
+    digest = hashlib.sha256(json.dumps([url, key_params]).encode()).hexdigest()
+    return _CACHE_DIR / f"{digest}.json"
+
+
+def load_cached(url, params):
+    """Return the cached JSON body for a request, or None if missing or stale"""
+    if not cache_enabled():
+        return None
+    path = _cache_path(url, params)
+    try:
+        if time.time() - path.stat().st_mtime > _CACHE_TTL_SECONDS:
+            return None
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached(url, params, data):
+    """Save a successful JSON body for later runs"""
+    if not cache_enabled():
+        return
+    _CACHE_DIR.mkdir(exist_ok=True)
+    _cache_path(url, params).write_text(json.dumps(data))
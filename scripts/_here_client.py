@@ -0,0 +1,18 @@
+"""
+Shared HereApiService for the HERE API test and debug scripts
+"""
+
+import atexit
+from functools import lru_cache
+
+import _bootstrap  # noqa: F401
+from _test_env import get_here_key
+from app.services.here_api_service import HereApiService
+
+
+@lru_cache(maxsize=1)
+def get_here_service():
+    """Return the process-wide HereApiService, closed automatically at exit"""
+    service = HereApiService(get_here_key())
+    atexit.register(service.close)
+    return service
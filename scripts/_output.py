@@ -0,0 +1,17 @@
+"""
+Buffered console output for the HERE API test and debug scripts
+"""
+
+import sys
+from contextlib import contextmanager
+
+
+@contextmanager
+def buffered_output():
+    """Collect report lines and write them to stdout in a single call on exit"""
+    lines = []
+    try:
+        yield lines.append
+    finally:
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
@@ -0,0 +1,14 @@
+"""
+Shared environment loading for the HERE API test and debug scripts
+"""
+
+import os
+from functools import lru_cache
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=1)
+def get_here_key():
+    """Load .env once per process and return HERE_API_KEY (None if unset)"""
+    load_dotenv()
+    return os.getenv("HERE_API_KEY")
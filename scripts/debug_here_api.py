@@ -3,19 +3,39 @@
 Debug script to examine HERE API response structure
 """
 
-import os
-import sys
 import json
-import requests
-from dotenv import load_dotenv
+import asyncio
+import aiohttp
+from _test_env import get_here_key
 
-# Load environment variables
-load_dotenv()
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def debug_here_api_responses():
+def _loads(raw):
+    """Decode a JSON payload, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _dumps(data):
+    """Pretty-print JSON with a 2-space indent, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+async def _fetch(session, url, params):
+    """GET a HERE endpoint, returning (status, parsed JSON or error text)"""
+    async with session.get(url, params=params) as response:
+        if response.status == 200:
+            return response.status, _loads(await response.read())
+        return response.status, await response.text()
+
+async def debug_here_api_responses():
     """Debug HERE API responses to understand the structure"""
     
-    here_api_key = os.getenv("HERE_API_KEY")
+    here_api_key = get_here_key()
     if not here_api_key:
         print("❌ HERE_API_KEY not set")
         return
@@ -27,31 +47,53 @@ def debug_here_api_responses():
     origin = (53.3498, -6.2603)  # Dublin City Centre
     destination = (53.34549242723791, -6.231834356978687)  # Indeed office
     
+    driving_url = "https://router.hereapi.com/v8/routes"
+    driving_params = {
+        "origin": f"{origin[0]},{origin[1]}",
+        "destination": f"{destination[0]},{destination[1]}",
+        "transportMode": "car",
+        "return": "summary,travelSummary",
+        "apiKey": here_api_key
+    }
+    transit_url = "https://transit.router.hereapi.com/v8/routes"
+    transit_params = {
+        "origin": f"{origin[0]},{origin[1]}",
+        "destination": f"{destination[0]},{destination[1]}",
+        "return": "travelSummary,polyline,actions",
+        "alternatives": 1,
+        "changes": 3,
+        "pedestrian[maxDistance]": 2000,
+        "pedestrian[speed]": 1.4,
+        "apiKey": here_api_key
+    }
+    
+    # Both requests share one pooled session and run concurrently
+    timeout = aiohttp.ClientTimeout(total=30)
+    connector = aiohttp.TCPConnector(ttl_dns_cache=300, use_dns_cache=True, limit_per_host=8)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        driving_result, transit_result = await asyncio.gather(
+            _fetch(session, driving_url, driving_params),
+            _fetch(session, transit_url, transit_params),
+            return_exceptions=True
+        )
+    
     # Test 1: Regular routing (driving)
     print("\n🚗 Testing regular routing (driving)...")
     try:
-        url = "https://router.hereapi.com/v8/routes"
-        params = {
-            "origin": f"{origin[0]},{origin[1]}",
-            "destination": f"{destination[0]},{destination[1]}",
-            "transportMode": "car",
-            "return": "summary,travelSummary",
-            "apiKey": here_api_key
-        }
-        
-        response = requests.get(url, params=params, timeout=30)
-        print(f"Status: {response.status_code}")
+        if isinstance(driving_result, Exception):
+            raise driving_result
+        status, data = driving_result
+        print(f"Status: {status}")
         
-        if response.status_code == 200:
-            data = response.json()
+        if status == 200:
             print("✅ API Response Structure:")
-            print(json.dumps(data, indent=2))
+            print(_dumps(data))
             
             # Check for routes
             if "routes" in data and data["routes"]:
                 route = data["routes"][0]
                 print(f"\n📋 First Route Structure:")
-                print(json.dumps(route, indent=2))
+                print(_dumps(route))
                 
                 # Check summary
                 if "summary" in route:
@@ -77,7 +119,7 @@ def debug_here_api_responses():
             else:
                 print("❌ No routes found in response")
         else:
-            print(f"❌ API Error: {response.text}")
+            print(f"❌ API Error: {data}")
             
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -86,30 +128,19 @@ def debug_here_api_responses():
     print("\n" + "=" * 60)
     print("🚌 Testing public transit routing...")
     try:
-        url = "https://transit.router.hereapi.com/v8/routes"
-        params = {
-            "origin": f"{origin[0]},{origin[1]}",
-            "destination": f"{destination[0]},{destination[1]}",
-            "return": "travelSummary,polyline,actions",
-            "alternatives": 1,
-            "changes": 3,
-            "pedestrian[maxDistance]": 2000,
-            "pedestrian[speed]": 1.4,
-            "apiKey": here_api_key
-        }
-        
-        response = requests.get(url, params=params, timeout=30)
-        print(f"Status: {response.status_code}")
+        if isinstance(transit_result, Exception):
+            raise transit_result
+        status, data = transit_result
+        print(f"Status: {status}")
         
-        if response.status_code == 200:
-            data = response.json()
+        if status == 200:
             print("✅ API Response Structure:")
-            print(json.dumps(data, indent=2))
+            print(_dumps(data))
             
             if "routes" in data and data["routes"]:
                 route = data["routes"][0]
                 print(f"\n📋 First Route Structure:")
-                print(json.dumps(route, indent=2))
+                print(_dumps(route))
                 
                 # Check sections
                 if "sections" in route:
@@ -129,7 +160,7 @@ def debug_here_api_responses():
             else:
                 print("❌ No routes found in response")
         else:
-            print(f"❌ API Error: {response.text}")
+            print(f"❌ API Error: {data}")
             
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -138,4 +169,4 @@ def debug_here_api_responses():
     print("🏁 Debug complete!")
 
 if __name__ == "__main__":
-    debug_here_api_responses()
+    asyncio.run(debug_here_api_responses())
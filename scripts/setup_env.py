@@ -4,7 +4,7 @@ Environment setup script for HouseHunter API
 """
 
 import os
-import shutil
+import re
 from pathlib import Path
 
 def setup_environment():
@@ -24,10 +24,9 @@ def setup_environment():
             print("Setup cancelled.")
             return
     
-    # Copy example file
+    # Start from the example file; all edits are applied in memory and written once
     if example_file.exists():
-        shutil.copy(example_file, env_file)
-        print("✅ Created .env file from env.example")
+        content = example_file.read_text()
     else:
         print("❌ env.example file not found!")
         return
@@ -41,16 +40,10 @@ def setup_environment():
     
     # Update .env file
     if notion_token and notion_db_id:
-        with open(env_file, 'r') as f:
-            content = f.read()
-        
         # Replace placeholder values
         content = content.replace("your_notion_integration_token_here", notion_token)
         content = content.replace("your_notion_database_id_here", notion_db_id)
         
-        with open(env_file, 'w') as f:
-            f.write(content)
-        
         print("✅ Notion configuration saved to .env file")
     else:
         print("⚠️  Notion configuration not provided. You'll need to edit .env manually.")
@@ -60,22 +53,17 @@ def setup_environment():
     
     api_port = input("API Port (default: 8000): ").strip()
     if api_port:
-        with open(env_file, 'r') as f:
-            content = f.read()
-        content = content.replace("API_PORT=8000", f"API_PORT={api_port}")
-        with open(env_file, 'w') as f:
-            f.write(content)
+        content = re.sub(r"^API_PORT=.*$", lambda _: f"API_PORT={api_port}", content, flags=re.M)
         print("✅ API port configuration saved")
     
     debug_mode = input("Enable debug mode? (y/N): ").lower()
     if debug_mode == 'y':
-        with open(env_file, 'r') as f:
-            content = f.read()
         content = content.replace("DEBUG=false", "DEBUG=true")
-        with open(env_file, 'w') as f:
-            f.write(content)
         print("✅ Debug mode enabled")
     
+    env_file.write_text(content)
+    print("✅ Created .env file from env.example")
+    
     print("\n🎉 Environment setup completed!")
     print("\nNext steps:")
     print("1. Review your .env file: cat .env")
@@ -3,6 +3,7 @@
 Script to set up Notion database with the correct properties for HouseHunter API
 """
 
+import copy
 import os
 import sys
 from notion_client import Client
@@ -23,112 +24,121 @@ def get_notion_client():
     
     return Client(auth=notion_token), database_id
 
-def get_required_properties() -> Dict[str, Dict[str, Any]]:
-    """Get the required properties for the HouseHunter database"""
-    return {
-        # Note: Title property is handled separately since databases can only have one title property
-        "Address": {
-            "type": "rich_text",
-            "rich_text": {}
-        },
-        "Property Type": {
-            "type": "select",
-            "select": {
-                "options": [
-                    {"name": "House", "color": "blue"},
-                    {"name": "Apartment", "color": "green"},
-                    {"name": "Duplex", "color": "yellow"},
-                    {"name": "Townhouse", "color": "orange"},
-                    {"name": "Bungalow", "color": "purple"},
-                    {"name": "Cottage", "color": "pink"},
-                    {"name": "Penthouse", "color": "red"},
-                    {"name": "Studio", "color": "gray"},
-                    {"name": "Land", "color": "brown"},
-                    {"name": "Commercial", "color": "default"}
-                ]
-            }
-        },
-        "City": {
-            "type": "rich_text",
-            "rich_text": {}
-        },
-        "County": {
-            "type": "rich_text",
-            "rich_text": {}
-        },
-        "Bedrooms": {
-            "type": "number",
-            "number": {
-                "format": "number"
-            }
-        },
-        "Bathrooms": {
-            "type": "number",
-            "number": {
-                "format": "number"
-            }
-        },
-        "Area (sqm)": {
-            "type": "number",
-            "number": {
-                "format": "number"
-            }
-        },
-        "Price": {
-            "type": "rich_text",
-            "rich_text": {}
-        },
-        "Energy Rating": {
-            "type": "rich_text",
-            "rich_text": {}
-        },
-        "Year Built": {
-            "type": "number",
-            "number": {
-                "format": "number"
-            }
-        },
-        "Status": {
-            "type": "select",
-            "select": {
-                "options": [
-                    {"name": "Active", "color": "green"},
-                    {"name": "Inactive", "color": "red"}
-                ]
-            }
-        },
-        "Date Added": {
-            "type": "date",
-            "date": {}
+# Required properties for the HouseHunter database
+_REQUIRED_PROPERTIES: Dict[str, Dict[str, Any]] = {
+    # Note: Title property is handled separately since databases can only have one title property
+    "Address": {
+        "type": "rich_text",
+        "rich_text": {}
+    },
+    "Property Type": {
+        "type": "select",
+        "select": {
+            "options": [
+                {"name": "House", "color": "blue"},
+                {"name": "Apartment", "color": "green"},
+                {"name": "Duplex", "color": "yellow"},
+                {"name": "Townhouse", "color": "orange"},
+                {"name": "Bungalow", "color": "purple"},
+                {"name": "Cottage", "color": "pink"},
+                {"name": "Penthouse", "color": "red"},
+                {"name": "Studio", "color": "gray"},
+                {"name": "Land", "color": "brown"},
+                {"name": "Commercial", "color": "default"}
+            ]
+        }
+    },
+    "City": {
+        "type": "rich_text",
+        "rich_text": {}
+    },
+    "County": {
+        "type": "rich_text",
+        "rich_text": {}
+    },
+    "Bedrooms": {
+        "type": "number",
+        "number": {
+            "format": "number"
+        }
+    },
+    "Bathrooms": {
+        "type": "number",
+        "number": {
+            "format": "number"
+        }
+    },
+    "Area (sqm)": {
+        "type": "number",
+        "number": {
+            "format": "number"
         }
+    },
+    "Price": {
+        "type": "rich_text",
+        "rich_text": {}
+    },
+    "Energy Rating": {
+        "type": "rich_text",
+        "rich_text": {}
+    },
+    "Year Built": {
+        "type": "number",
+        "number": {
+            "format": "number"
+        }
+    },
+    "Status": {
+        "type": "select",
+        "select": {
+            "options": [
+                {"name": "Active", "color": "green"},
+                {"name": "Inactive", "color": "red"}
+            ]
+        }
+    },
+    "Date Added": {
+        "type": "date",
+        "date": {}
     }
+}
 
-def get_optional_properties() -> Dict[str, Dict[str, Any]]:
-    """Get the optional properties for the HouseHunter database"""
-    return {
-        "Lot Size (sqm)": {
-            "type": "number",
-            "number": {
-                "format": "number"
-            }
-        },
-        "New Build": {
-            "type": "checkbox",
-            "checkbox": {}
-        },
-        "Furnished": {
-            "type": "checkbox",
-            "checkbox": {}
-        },
-        "Parking": {
-            "type": "rich_text",
-            "rich_text": {}
-        },
-        "Heating": {
-            "type": "rich_text",
-            "rich_text": {}
+# Optional properties for the HouseHunter database
+_OPTIONAL_PROPERTIES: Dict[str, Dict[str, Any]] = {
+    "Lot Size (sqm)": {
+        "type": "number",
+        "number": {
+            "format": "number"
         }
+    },
+    "New Build": {
+        "type": "checkbox",
+        "checkbox": {}
+    },
+    "Furnished": {
+        "type": "checkbox",
+        "checkbox": {}
+    },
+    "Parking": {
+        "type": "rich_text",
+        "rich_text": {}
+    },
+    "Heating": {
+        "type": "rich_text",
+        "rich_text": {}
     }
+}
+
+# Full schema, merged once at import
+_ALL_PROPERTIES: Dict[str, Dict[str, Any]] = {**_REQUIRED_PROPERTIES, **_OPTIONAL_PROPERTIES}
+
+def get_required_properties() -> Dict[str, Dict[str, Any]]:
+    """Get a copy of the required properties for the HouseHunter database"""
+    return copy.deepcopy(_REQUIRED_PROPERTIES)
+
+def get_optional_properties() -> Dict[str, Dict[str, Any]]:
+    """Get a copy of the optional properties for the HouseHunter database"""
+    return copy.deepcopy(_OPTIONAL_PROPERTIES)
 
 def check_existing_properties(client: Client, database_id: str) -> List[str]:
     """Check what properties already exist in the database"""
@@ -143,13 +153,14 @@ def check_existing_properties(client: Client, database_id: str) -> List[str]:
 
 def create_missing_properties(client: Client, database_id: str, existing_properties: List[str]):
     """Create missing properties in the database"""
-    all_required_properties = {**get_required_properties(), **get_optional_properties()}
+    existing_set = set(existing_properties)
     
     # Find missing properties
-    missing_properties = {}
-    for prop_name, prop_config in all_required_properties.items():
-        if prop_name not in existing_properties:
-            missing_properties[prop_name] = prop_config
+    missing_properties = {
+        prop_name: prop_config
+        for prop_name, prop_config in _ALL_PROPERTIES.items()
+        if prop_name not in existing_set
+    }
     
     if not missing_properties:
         print("✅ All required properties already exist!")
@@ -3,112 +3,77 @@
 Test script to verify the fixed HERE API service
 """
 
-import os
-import sys
 import asyncio
-from dotenv import load_dotenv
+from _output import buffered_output
+from _test_env import get_here_key
 
-# Add the app directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-
-# Load environment variables
-load_dotenv()
+# Put the repository root on the path for the app imports
+import _bootstrap  # noqa: F401
 
 async def test_fixed_here_api():
     """Test the fixed HERE API service"""
-    
-    try:
-        from app.services.here_api_service import HereApiService
-        from app.models.interest_points import TransportationMode
-        
-        print("🔍 Testing Fixed HERE API Service...")
-        print("=" * 50)
-        
-        # Check environment variables
-        here_api_key = os.getenv("HERE_API_KEY")
-        if not here_api_key:
-            print("❌ HERE_API_KEY not set")
-            return False
-        
-        # Create service instance
-        here_service = HereApiService(here_api_key)
-        
-        # Test coordinates (Dublin City Centre to Indeed office)
-        origin_lat, origin_lng = 53.3498, -6.2603  # Dublin City Centre
-        dest_lat, dest_lng = 53.34549242723791, -6.231834356978687  # Indeed office
-        
-        print(f"📍 Testing route from ({origin_lat}, {origin_lng}) to ({dest_lat}, {dest_lng})")
-        
-        # Test 1: Driving mode
-        print("\n🚗 Testing DRIVING mode...")
+    with buffered_output() as out:
         try:
-            result = await here_service.calculate_prediction_time(
-                origin_lat, origin_lng, dest_lat, dest_lng, TransportationMode.DRIVING
-            )
+            from _here_client import get_here_service
+            from app.models.interest_points import TransportationMode
             
-            if result:
-                print("✅ Success!")
-                print(f"  Duration: {result.get('duration_minutes')} minutes")
-                print(f"  Distance: {result.get('distance_km', 0):.1f} km")
-                print(f"  Departure: {result.get('departure_time')}")
-                print(f"  Arrival: {result.get('arrival_time')}")
-            else:
-                print("❌ Failed to get prediction")
-                
-        except Exception as e:
-            print(f"❌ Error: {e}")
-        
-        # Test 2: Public transport mode
-        print("\n🚌 Testing PUBLIC_TRANSPORT mode...")
-        try:
-            result = await here_service.calculate_prediction_time(
-                origin_lat, origin_lng, dest_lat, dest_lng, TransportationMode.PUBLIC_TRANSPORT
-            )
+            out("🔍 Testing Fixed HERE API Service...")
+            out("=" * 50)
             
-            if result:
-                print("✅ Success!")
-                print(f"  Duration: {result.get('duration_minutes')} minutes")
-                print(f"  Distance: {result.get('distance_km', 0):.1f} km")
-                print(f"  Departure: {result.get('departure_time')}")
-                print(f"  Arrival: {result.get('arrival_time')}")
-                print(f"  Walking: {result.get('total_walking_minutes', 0)} min")
-                print(f"  Walking distance: {result.get('total_walking_distance_km', 0):.1f} km")
-            else:
-                print("❌ Failed to get prediction")
-                
-        except Exception as e:
-            print(f"❌ Error: {e}")
-        
-        # Test 3: Walking mode
-        print("\n🚶 Testing WALKING mode...")
-        try:
-            result = await here_service.calculate_prediction_time(
-                origin_lat, origin_lng, dest_lat, dest_lng, TransportationMode.WALKING
-            )
+            # Check environment variables
+            here_api_key = get_here_key()
+            if not here_api_key:
+                out("❌ HERE_API_KEY not set")
+                return False
+            
+            # Create service instance
+            here_service = get_here_service()
+            
+            # Test coordinates (Dublin City Centre to Indeed office)
+            origin_lat, origin_lng = 53.3498, -6.2603  # Dublin City Centre
+            dest_lat, dest_lng = 53.34549242723791, -6.231834356978687  # Indeed office
             
-            if result:
-                print("✅ Success!")
-                print(f"  Duration: {result.get('duration_minutes')} minutes")
-                print(f"  Distance: {result.get('distance_km', 0):.1f} km")
-                print(f"  Departure: {result.get('departure_time')}")
-                print(f"  Arrival: {result.get('arrival_time')}")
-            else:
-                print("❌ Failed to get prediction")
-                
+            out(f"📍 Testing route from ({origin_lat}, {origin_lng}) to ({dest_lat}, {dest_lng})")
+            
+            # The three modes are independent requests, so run them concurrently
+            modes = [TransportationMode.DRIVING, TransportationMode.PUBLIC_TRANSPORT, TransportationMode.WALKING]
+            results = await asyncio.gather(*[
+                here_service.calculate_prediction_time(origin_lat, origin_lng, dest_lat, dest_lng, mode)
+                for mode in modes
+            ], return_exceptions=True)
+            mode_labels = {
+                TransportationMode.DRIVING: "🚗 Testing DRIVING mode...",
+                TransportationMode.PUBLIC_TRANSPORT: "🚌 Testing PUBLIC_TRANSPORT mode...",
+                TransportationMode.WALKING: "🚶 Testing WALKING mode..."
+            }
+            
+            for mode, result in zip(modes, results):
+                out(f"\n{mode_labels[mode]}")
+                if isinstance(result, Exception):
+                    out(f"❌ Error: {result}")
+                elif result:
+                    out("✅ Success!")
+                    out(f"  Duration: {result.get('duration_minutes')} minutes")
+                    out(f"  Distance: {result.get('distance_km', 0):.1f} km")
+                    out(f"  Departure: {result.get('departure_time')}")
+                    out(f"  Arrival: {result.get('arrival_time')}")
+                    if mode == TransportationMode.PUBLIC_TRANSPORT:
+                        out(f"  Walking: {result.get('total_walking_minutes', 0)} min")
+                        out(f"  Walking distance: {result.get('total_walking_distance_km', 0):.1f} km")
+                else:
+                    out("❌ Failed to get prediction")
+            
+            out("\n" + "=" * 50)
+            out("🏁 Testing complete!")
+            
+            return True
+            
+        except ImportError as e:
+            out(f"❌ Import error: {e}")
+            return False
         except Exception as e:
-            print(f"❌ Error: {e}")
-        
-        print("\n" + "=" * 50)
-        print("🏁 Testing complete!")
-        
-        return True
-        
-    except ImportError as e:
-        print(f"❌ Import error: {e}")
-        return False
-    except Exception as e:
-        print(f"❌ Unexpected error: {e}")
-        return False
+            out(f"❌ Unexpected error: {e}")
+            return False
 
 if __name__ == "__main__":
     asyncio.run(test_fixed_here_api())
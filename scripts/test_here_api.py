@@ -4,151 +4,187 @@ Test script to diagnose HERE API connection issues
 """
 
 import os
-import sys
-import requests
+import asyncio
+import aiohttp
 from datetime import date, timedelta
-from dotenv import load_dotenv
+from _here_cache import cache_enabled, load_cached, store_cached
+from _output import buffered_output
+from _test_env import get_here_key
 
-# Add the app directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
+BASE_URL = "https://router.hereapi.com/v8"
+TRANSIT_URL = "https://transit.router.hereapi.com/v8"
 
-# Load environment variables
-load_dotenv()
+# Test coordinates (Dublin City Centre to Indeed office)
+ORIGIN = (53.3498, -6.2603)  # Dublin City Centre
+DESTINATION = (53.34549242723791, -6.231834356978687)  # Indeed office
+ORIGIN_STR = f"{ORIGIN[0]},{ORIGIN[1]}"
+DEST_STR = f"{DESTINATION[0]},{DESTINATION[1]}"
 
-def test_here_api_connection():
-    """Test HERE API connection and basic functionality"""
+async def _get(session, label, url, params):
+    """GET a HERE endpoint, returning (label, status, parsed JSON or error text)"""
+    cached = load_cached(url, params)
+    if cached is not None:
+        return label, 200, cached
     
-    print("🔍 Testing HERE API Connection...")
-    print("=" * 50)
-    
-    # Check environment variables
-    here_api_key = os.getenv("HERE_API_KEY")
-    here_api_enabled = os.getenv("HERE_API_ENABLED", "false").lower() == "true"
-    
-    print(f"HERE_API_KEY: {'✅ Set' if here_api_key else '❌ Not set'}")
-    print(f"HERE_API_ENABLED: {'✅ True' if here_api_enabled else '❌ False'}")
-    
-    if not here_api_key:
-        print("\n❌ HERE_API_KEY environment variable is not set!")
-        print("Please create a .env file with your HERE API key:")
-        print("HERE_API_KEY=your_api_key_here")
-        print("HERE_API_ENABLED=true")
-        return False
-    
-    if not here_api_enabled:
-        print("\n❌ HERE_API_ENABLED is set to false!")
-        print("Please set HERE_API_ENABLED=true in your .env file")
-        return False
-    
-    # Test basic API endpoints
-    print("\n🌐 Testing API Endpoints...")
-    
-    # Test routing API
-    base_url = "https://router.hereapi.com/v8"
-    transit_url = "https://transit.router.hereapi.com/v8"
-    
-    # Test coordinates (Dublin City Centre to Indeed office)
-    origin = (53.3498, -6.2603)  # Dublin City Centre
-    destination = (53.34549242723791, -6.231834356978687)  # Indeed office
-    
-    # Test 1: Regular routing (driving)
-    print("\n🚗 Testing regular routing (driving)...")
-    try:
-        url = f"{base_url}/routes"
-        params = {
-            "origin": f"{origin[0]},{origin[1]}",
-            "destination": f"{destination[0]},{destination[1]}",
-            "transportMode": "car",
-            "return": "summary,travelSummary",
-            "apiKey": here_api_key
-        }
+    async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=30)) as response:
+        if response.status == 200:
+            data = await response.json()
+            store_cached(url, params, data)
+            return label, response.status, data
+        return label, response.status, await response.text()
+
+async def _probe_driving(session, base_params):
+    """Probe regular (driving) routing"""
+    params = {
+        **base_params,
+        "transportMode": "car",
+        "return": "summary,travelSummary"
+    }
+    return await _get(session, "driving", f"{BASE_URL}/routes", params)
+
+async def _probe_transit(session, base_params):
+    """Probe public transit routing"""
+    params = {
+        **base_params,
+        # Only route and section counts are reported, so skip the bulky polyline/actions
+        "return": "travelSummary",
+        "alternatives": 1,
+        "changes": 3,
+        "pedestrian[maxDistance]": 2000,
+        "pedestrian[speed]": 1.4
+    }
+    return await _get(session, "transit", f"{TRANSIT_URL}/routes", params)
+
+async def _probe_matrix(session, base_params):
+    """Probe matrix routing"""
+    params = {
+        "origins": ORIGIN_STR,
+        "destinations": DEST_STR,
+        "transportMode": "car",
+        "return": "travelSummary",
+        "apiKey": base_params["apiKey"]
+    }
+    return await _get(session, "matrix", f"{BASE_URL}/matrix", params)
+
+async def test_here_api_connection(session: aiohttp.ClientSession):
+    """Test HERE API connection and basic functionality over the given session"""
+    with buffered_output() as out:
+        out("🔍 Testing HERE API Connection...")
+        out("=" * 50)
         
-        response = requests.get(url, params=params, timeout=30)
-        print(f"Status: {response.status_code}")
+        # Check environment variables
+        here_api_key = get_here_key()
+        here_api_enabled = os.getenv("HERE_API_ENABLED", "false").lower() == "true"
         
-        if response.status_code == 200:
-            data = response.json()
-            if "routes" in data and data["routes"]:
-                route = data["routes"][0]
-                summary = route.get("summary", {})
-                duration = summary.get("duration", 0) // 60
-                distance = summary.get("length", 0) / 1000
-                print(f"✅ Success! Duration: {duration}min, Distance: {distance:.1f}km")
-            else:
-                print("⚠️  API returned success but no routes found")
-                print(f"Response: {data}")
-        else:
-            print(f"❌ API Error: {response.text}")
-            
-    except Exception as e:
-        print(f"❌ Error testing regular routing: {e}")
-    
-    # Test 2: Public transit routing
-    print("\n🚌 Testing public transit routing...")
-    try:
-        url = f"{transit_url}/routes"
-        params = {
-            "origin": f"{origin[0]},{origin[1]}",
-            "destination": f"{destination[0]},{destination[1]}",
-            "return": "travelSummary,polyline,actions",
-            "alternatives": 1,
-            "changes": 3,
-            "pedestrian[maxDistance]": 2000,
-            "pedestrian[speed]": 1.4,
-            "apiKey": here_api_key
-        }
+        out(f"HERE_API_KEY: {'✅ Set' if here_api_key else '❌ Not set'}")
+        out(f"HERE_API_ENABLED: {'✅ True' if here_api_enabled else '❌ False'}")
+        if cache_enabled():
+            out("HERE_PROBE_CACHE: ♻️ Reusing responses from .here_cache (up to 1 hour old)")
         
-        response = requests.get(url, params=params, timeout=30)
-        print(f"Status: {response.status_code}")
+        if not here_api_key:
+            out("\n❌ HERE_API_KEY environment variable is not set!")
+            out("Please create a .env file with your HERE API key:")
+            out("HERE_API_KEY=your_api_key_here")
+            out("HERE_API_ENABLED=true")
+            return False
         
-        if response.status_code == 200:
-            data = response.json()
-            if "routes" in data and data["routes"]:
-                route = data["routes"][0]
-                print(f"✅ Success! Found {len(data['routes'])} route(s)")
-                if "sections" in route:
-                    print(f"Route has {len(route['sections'])} sections")
-            else:
-                print("⚠️  API returned success but no routes found")
-                print(f"Response: {data}")
-        else:
-            print(f"❌ API Error: {response.text}")
-            
-    except Exception as e:
-        print(f"❌ Error testing public transit routing: {e}")
-    
-    # Test 3: Matrix routing
-    print("\n📊 Testing matrix routing...")
-    try:
-        url = f"{base_url}/matrix"
-        params = {
-            "origins": f"{origin[0]},{origin[1]}",
-            "destinations": f"{destination[0]},{destination[1]}",
-            "transportMode": "car",
-            "return": "travelSummary",
-            "apiKey": here_api_key
-        }
+        if not here_api_enabled:
+            out("\n❌ HERE_API_ENABLED is set to false!")
+            out("Please set HERE_API_ENABLED=true in your .env file")
+            return False
+        
+        # Test basic API endpoints
+        out("\n🌐 Testing API Endpoints...")
+        
+        # Parameters shared by every routing probe
+        base_params = {"origin": ORIGIN_STR, "destination": DEST_STR, "apiKey": here_api_key}
         
-        response = requests.get(url, params=params, timeout=30)
-        print(f"Status: {response.status_code}")
+        # The three probes are independent, so run them concurrently over the shared session
+        results = await asyncio.gather(
+            _probe_driving(session, base_params),
+            _probe_transit(session, base_params),
+            _probe_matrix(session, base_params),
+            return_exceptions=True
+        )
+        driving_result, transit_result, matrix_result = results
         
-        if response.status_code == 200:
-            data = response.json()
-            if "matrix" in data:
-                print("✅ Success! Matrix routing working")
+        # Test 1: Regular routing (driving)
+        out("\n🚗 Testing regular routing (driving)...")
+        try:
+            if isinstance(driving_result, Exception):
+                raise driving_result
+            _, status, data = driving_result
+            out(f"Status: {status}")
+            
+            if status == 200:
+                if "routes" in data and data["routes"]:
+                    route = data["routes"][0]
+                    summary = route.get("summary", {})
+                    duration = summary.get("duration", 0) // 60
+                    distance = summary.get("length", 0) / 1000
+                    out(f"✅ Success! Duration: {duration}min, Distance: {distance:.1f}km")
+                else:
+                    out("⚠️  API returned success but no routes found")
+                    out(f"Response: {data}")
             else:
-                print("⚠️  API returned success but no matrix data")
-                print(f"Response: {data}")
-        else:
-            print(f"❌ API Error: {response.text}")
+                out(f"❌ API Error: {data}")
+                
+        except Exception as e:
+            out(f"❌ Error testing regular routing: {e}")
+        
+        # Test 2: Public transit routing
+        out("\n🚌 Testing public transit routing...")
+        try:
+            if isinstance(transit_result, Exception):
+                raise transit_result
+            _, status, data = transit_result
+            out(f"Status: {status}")
             
-    except Exception as e:
-        print(f"❌ Error testing matrix routing: {e}")
-    
-    print("\n" + "=" * 50)
-    print("🏁 Testing complete!")
-    
-    return True
+            if status == 200:
+                if "routes" in data and data["routes"]:
+                    route = data["routes"][0]
+                    out(f"✅ Success! Found {len(data['routes'])} route(s)")
+                    if "sections" in route:
+                        out(f"Route has {len(route['sections'])} sections")
+                else:
+                    out("⚠️  API returned success but no routes found")
+                    out(f"Response: {data}")
+            else:
+                out(f"❌ API Error: {data}")
+                
+        except Exception as e:
+            out(f"❌ Error testing public transit routing: {e}")
+        
+        # Test 3: Matrix routing
+        out("\n📊 Testing matrix routing...")
+        try:
+            if isinstance(matrix_result, Exception):
+                raise matrix_result
+            _, status, data = matrix_result
+            out(f"Status: {status}")
+            
+            if status == 200:
+                if "matrix" in data:
+                    out("✅ Success! Matrix routing working")
+                else:
+                    out("⚠️  API returned success but no matrix data")
+                    out(f"Response: {data}")
+            else:
+                out(f"❌ API Error: {data}")
+                
+        except Exception as e:
+            out(f"❌ Error testing matrix routing: {e}")
+        
+        out("\n" + "=" * 50)
+        out("🏁 Testing complete!")
+        
+        return True
+
+async def _main():
+    """Open one pooled session for all probes and run them"""
+    connector = aiohttp.TCPConnector(limit=10, ttl_dns_cache=300, use_dns_cache=True, limit_per_host=8)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await test_here_api_connection(session)
 
 if __name__ == "__main__":
-    test_here_api_connection()
+    asyncio.run(_main())
@@ -3,127 +3,150 @@
 Debug script to test interest points service and identify the issue
 """
 
-import os
-import sys
 import asyncio
-from dotenv import load_dotenv
+import traceback
+from _output import buffered_output
+from _test_env import get_here_key
 
-# Add the app directory to the Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# Put the repository root on the path for the app imports
+import _bootstrap  # noqa: F401
 
 from app.services.interest_points_service import InterestPointsService
-from app.services.here_api_service import HereApiService
+from _here_client import get_here_service
 
-# Load environment variables
-load_dotenv()
+# Points further than this in a straight line are not worth a HERE request
+_MAX_PROBE_DISTANCE_KM = 100.0
 
 async def test_interest_points_service():
     """Test the interest points service to identify the issue"""
-    
-    here_api_key = os.getenv("HERE_API_KEY")
-    if not here_api_key:
-        print("❌ HERE_API_KEY not set")
-        return
-    
-    print("🔍 Testing Interest Points Service...")
-    print("=" * 60)
-    
-    # Initialize services
-    interest_points_service = InterestPointsService("config/interest_points_config.json")
-    here_service = HereApiService(here_api_key)
-    
-    # Test coordinates (Dublin City Centre)
-    test_lat = 53.3498
-    test_lng = -6.2603
-    test_address = "Dublin City Centre, Co. Dublin"
-    
-    print(f"📍 Testing with coordinates: {test_lat}, {test_lng}")
-    print(f"🏠 Address: {test_address}")
-    
-    # Check if interest points are loaded
-    active_points = interest_points_service.get_active_interest_points()
-    print(f"🎯 Active interest points: {len(active_points)}")
-    
-    for point in active_points:
-        print(f"  • {point.id}: {point.name} ({point.default_transportation_mode.value})")
-    
-    if not active_points:
-        print("❌ No active interest points found!")
-        return
-    
-    # Test the calculate_predictions_for_property method
-    print("\n🚗 Testing calculate_predictions_for_property...")
-    try:
-        prediction_info = await interest_points_service.calculate_predictions_for_property(
-            test_lat, test_lng, test_address
-        )
+    with buffered_output() as out:
+        here_api_key = get_here_key()
+        if not here_api_key:
+            out("❌ HERE_API_KEY not set")
+            return
         
-        if prediction_info:
-            print(f"✅ Prediction info created successfully")
-            print(f"📊 Property ID: {prediction_info.property_id}")
-            print(f"📍 Property Address: {prediction_info.property_address}")
-            print(f"📅 Prediction Date: {prediction_info.prediction_date}")
-            print(f"🔢 Number of predictions: {len(prediction_info.predictions)}")
+        out("🔍 Testing Interest Points Service...")
+        out("=" * 60)
+        
+        # Initialize services
+        interest_points_service = InterestPointsService("config/interest_points_config.json")
+        here_service = get_here_service()
+        
+        # Test coordinates (Dublin City Centre)
+        test_lat = 53.3498
+        test_lng = -6.2603
+        test_address = "Dublin City Centre, Co. Dublin"
+        
+        out(f"📍 Testing with coordinates: {test_lat}, {test_lng}")
+        out(f"🏠 Address: {test_address}")
+        
+        # Check if interest points are loaded
+        active_points = interest_points_service.get_active_interest_points()
+        out(f"🎯 Active interest points: {len(active_points)}")
+        
+        # Read each point's coordinates once for the pre-filter and the HERE calls
+        coords = [(point.latitude, point.longitude) for point in active_points]
+        # distances_from covers every point in list order; keep the active ones
+        distances = [
+            distance
+            for point, distance in zip(
+                interest_points_service.get_all_interest_points(),
+                interest_points_service.distances_from(test_lat, test_lng)
+            )
+            if point.is_active
+        ]
+        
+        for point, distance in zip(active_points, distances):
+            out(f"  • {point.id}: {point.name} ({point.default_transportation_mode.value}, {distance:.1f} km away)")
+        
+        if not active_points:
+            out("❌ No active interest points found!")
+            return
+        
+        # Test the calculate_predictions_for_property method
+        out("\n🚗 Testing calculate_predictions_for_property...")
+        try:
+            prediction_info = await interest_points_service.calculate_predictions_for_property(
+                test_lat, test_lng, test_address
+            )
             
-            if prediction_info.predictions:
-                for i, prediction in enumerate(prediction_info.predictions):
-                    print(f"\n  Prediction {i+1}:")
-                    print(f"    Destination: {prediction.destination_point_id}")
-                    print(f"    Mode: {prediction.transportation_mode.value}")
-                    print(f"    Duration: {prediction.duration_minutes} min")
-                    print(f"    Distance: {prediction.distance_km:.3f} km")
-                    print(f"    Departure: {prediction.departure_time}")
-                    print(f"    Arrival: {prediction.arrival_time}")
-                    
-                    if prediction.route_details:
-                        print(f"    Route details: {len(prediction.route_details)} sections")
-                    else:
-                        print(f"    Route details: None")
+            if prediction_info:
+                out(f"✅ Prediction info created successfully")
+                out(f"📊 Property ID: {prediction_info.property_id}")
+                out(f"📍 Property Address: {prediction_info.property_address}")
+                out(f"📅 Prediction Date: {prediction_info.prediction_date}")
+                out(f"🔢 Number of predictions: {len(prediction_info.predictions)}")
+                
+                if prediction_info.predictions:
+                    for i, prediction in enumerate(prediction_info.predictions):
+                        out(f"\n  Prediction {i+1}:")
+                        out(f"    Destination: {prediction.destination_point_id}")
+                        out(f"    Mode: {prediction.transportation_mode.value}")
+                        out(f"    Duration: {prediction.duration_minutes} min")
+                        out(f"    Distance: {prediction.distance_km:.3f} km")
+                        out(f"    Departure: {prediction.departure_time}")
+                        out(f"    Arrival: {prediction.arrival_time}")
+                        
+                        if prediction.route_details:
+                            out(f"    Route details: {len(prediction.route_details)} sections")
+                        else:
+                            out(f"    Route details: None")
+                else:
+                    out("❌ No predictions in the prediction info")
             else:
-                print("❌ No predictions in the prediction info")
-        else:
-            print("❌ Prediction info is None")
-            
-    except Exception as e:
-        print(f"❌ Error in calculate_predictions_for_property: {e}")
-        import traceback
-        print(f"Traceback: {traceback.format_exc()}")
-    
-    # Test individual HERE API calls
-    print("\n" + "=" * 60)
-    print("🔍 Testing individual HERE API calls...")
-    
-    for point in active_points[:2]:  # Test first 2 points
-        print(f"\n🎯 Testing route to {point.name} ({point.id})")
-        print(f"📍 Destination: {point.latitude}, {point.lng}")
-        print(f"🚌 Mode: {point.default_transportation_mode.value}")
+                out("❌ Prediction info is None")
+                
+        except Exception as e:
+            out(f"❌ Error in calculate_predictions_for_property: {e}")
+            out(f"Traceback: {traceback.format_exc()}")
         
-        try:
-            prediction_data = await here_service.calculate_prediction_time(
+        # Test individual HERE API calls
+        out("\n" + "=" * 60)
+        out("🔍 Testing individual HERE API calls...")
+        
+        # The points are independent, so fetch their routes concurrently and print afterwards
+        # Skip points that are obviously out of range without spending HERE quota
+        candidates = [
+            (point, coord)
+            for point, coord, distance in zip(active_points, coords, distances)
+            if distance <= _MAX_PROBE_DISTANCE_KM
+        ]
+        skipped = len(active_points) - len(candidates)
+        if skipped:
+            out(f"⏭️ Skipping {skipped} point(s) more than {_MAX_PROBE_DISTANCE_KM:.0f} km away")
+        
+        test_points = candidates[:2]  # Test first 2 points
+        results = await asyncio.gather(*[
+            here_service.calculate_prediction_time(
                 test_lat, test_lng,
-                point.latitude, point.longitude,
+                dest_lat, dest_lng,
                 point.default_transportation_mode
             )
+            for point, (dest_lat, dest_lng) in test_points
+        ], return_exceptions=True)
+        
+        for (point, (dest_lat, dest_lng)), prediction_data in zip(test_points, results):
+            out(f"\n🎯 Testing route to {point.name} ({point.id})")
+            out(f"📍 Destination: {dest_lat}, {dest_lng}")
+            out(f"🚌 Mode: {point.default_transportation_mode.value}")
             
-            if prediction_data:
-                print(f"✅ HERE API call successful")
-                print(f"📊 Distance: {prediction_data.get('distance_km', 'N/A')} km")
-                print(f"⏱️ Duration: {prediction_data.get('duration_minutes', 'N/A')} min")
-                print(f"🚗 Mode: {prediction_data.get('transport_mode', 'N/A')}")
-                print(f"🕐 Departure: {prediction_data.get('departure_time', 'N/A')}")
-                print(f"🕐 Arrival: {prediction_data.get('arrival_time', 'N/A')}")
+            if isinstance(prediction_data, Exception):
+                out(f"❌ Error in HERE API call: {prediction_data}")
+                out(f"Traceback: {''.join(traceback.format_exception(prediction_data))}")
+            elif prediction_data:
+                out(f"✅ HERE API call successful")
+                out(f"📊 Distance: {prediction_data.get('distance_km', 'N/A')} km")
+                out(f"⏱️ Duration: {prediction_data.get('duration_minutes', 'N/A')} min")
+                out(f"🚗 Mode: {prediction_data.get('transport_mode', 'N/A')}")
+                out(f"🕐 Departure: {prediction_data.get('departure_time', 'N/A')}")
+                out(f"🕐 Arrival: {prediction_data.get('arrival_time', 'N/A')}")
                 
                 if prediction_data.get('route_details'):
-                    print(f"🛣️ Route details: {len(prediction_data['route_details'])} sections")
+                    out(f"🛣️ Route details: {len(prediction_data['route_details'])} sections")
                 else:
-                    print(f"🛣️ Route details: None")
+                    out(f"🛣️ Route details: None")
             else:
-                print(f"❌ HERE API call returned None")
-                
-        except Exception as e:
-            print(f"❌ Error in HERE API call: {e}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
+                out(f"❌ HERE API call returned None")
 
 if __name__ == "__main__":
     asyncio.run(test_interest_points_service())
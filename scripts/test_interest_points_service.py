@@ -4,15 +4,12 @@ Test script to verify the interest points service works with the fixed HERE API
 """
 
 import os
-import sys
 import asyncio
-from dotenv import load_dotenv
+import traceback
+from _test_env import get_here_key
 
-# Add the app directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-
-# Load environment variables
-load_dotenv()
+# Put the repository root on the path for the app imports
+import _bootstrap  # noqa: F401
 
 async def test_interest_points_service():
     """Test the interest points service with fixed HERE API"""
@@ -24,7 +21,7 @@ async def test_interest_points_service():
         print("=" * 50)
         
         # Check environment variables
-        here_api_key = os.getenv("HERE_API_KEY")
+        here_api_key = get_here_key()
         if not here_api_key:
             print("❌ HERE_API_KEY not set")
             return False
@@ -76,7 +73,6 @@ async def test_interest_points_service():
                 
         except Exception as e:
             print(f"❌ Error calculating predictions: {e}")
-            import traceback
             traceback.print_exc()
         
         print("\n" + "=" * 50)
@@ -89,7 +85,6 @@ async def test_interest_points_service():
         return False
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
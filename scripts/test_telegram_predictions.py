@@ -3,12 +3,11 @@
 Test script to verify telegram service predictions are working
 """
 
-import os
-import sys
+import traceback
 from dotenv import load_dotenv
 
-# Add the app directory to the Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+# Put the repository root on the path for the app imports
+import _bootstrap  # noqa: F401
 
 from app.services.telegram_service import TelegramService
 from app.services.interest_points_service import InterestPointsService
@@ -21,7 +20,7 @@ async def test_telegram_predictions():
     
     # Initialize services
     interest_points_service = InterestPointsService("config/interest_points_config.json")
-    telegram_service = TelegramService()
+    telegram_service = TelegramService(interest_points_service=interest_points_service)
     
     # Test coordinates (Dublin city center)
     test_coordinates = {
@@ -36,6 +35,7 @@ async def test_telegram_predictions():
     try:
         points = interest_points_service.get_active_interest_points()
         print(f"✅ Loaded {len(points)} active interest points")
+        point_by_id = {p.id: p for p in points}
         
         # Test prediction calculation
         predictions = await interest_points_service.calculate_predictions_for_property(
@@ -48,7 +48,7 @@ async def test_telegram_predictions():
             print(f"✅ Successfully calculated {len(predictions.predictions)} predictions")
             for pred in predictions.predictions:
                 # Get the point name from the destination_point_id
-                point = interest_points_service.get_interest_point_by_id(pred.destination_point_id)
+                point = point_by_id.get(pred.destination_point_id)
                 point_name = point.name if point else pred.destination_point_id
                 print(f"   - {point_name}: {pred.duration_minutes} min")
         else:
@@ -56,7 +56,6 @@ async def test_telegram_predictions():
             
     except Exception as e:
         print(f"❌ Error: {e}")
-        import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
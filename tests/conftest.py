@@ -2,14 +2,31 @@
 Pytest configuration for HouseHunter API tests
 """
 
+import asyncio
+import copy
 import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
 import os
 import sys
 from pathlib import Path
 
-# Add the app directory to the Python path
-app_dir = Path(__file__).parent.parent / "app"
-sys.path.insert(0, str(app_dir))
+# Add the repository root to the Python path so tests import the app package
+root_dir = Path(__file__).parent.parent
+if str(root_dir) not in sys.path:
+    sys.path.insert(0, str(root_dir))
+
+# Script-style checks that talk to a live API and report by printing; run them directly
+collect_ignore = [
+    "test_notion_integration.py",
+    "integration/test_here_connection.py",
+]
+
+# Import the service modules once up front so their import cost is not charged to the first test
+import app.scrapers.scraper_factory  # noqa: F401,E402
+import app.services.notion_service  # noqa: F401,E402
+import app.services.property_service  # noqa: F401,E402
+import app.services.telegram_service  # noqa: F401,E402
 
 @pytest.fixture
 def test_env():
@@ -20,4 +37,112 @@ def test_env():
     yield
     # Clean up
     os.environ.pop("NOTION_TOKEN", None)
-    os.environ.pop("NOTION_DATABASE_ID", None) 
\ No newline at end of file
+    os.environ.pop("NOTION_DATABASE_ID", None) 
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """One event loop shared by every async test in the session"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest.fixture
+def empty_telegram_env(monkeypatch):
+    """Environment without a Telegram bot token, also cleared from the loaded config"""
+    from app.config import config
+    
+    monkeypatch.delenv("TELEGRAM_BOT_TOKEN", raising=False)
+    monkeypatch.setattr(config, "TELEGRAM_BOT_TOKEN", None)
+    return monkeypatch
+
+@pytest.fixture
+def telegram_token_env(empty_telegram_env):
+    """Environment whose TELEGRAM_BOT_TOKEN is set to a test token"""
+    from app.config import config
+    
+    empty_telegram_env.setenv("TELEGRAM_BOT_TOKEN", "test_token")
+    empty_telegram_env.setattr(config, "TELEGRAM_BOT_TOKEN", "test_token")
+    return empty_telegram_env
+
+@pytest.fixture
+def fast_services(monkeypatch):
+    """Make the services TelegramService builds by default skip their real setup"""
+    from app.scrapers.scraper_factory import ScraperFactory
+    from app.services.geocoding_service import GeocodingService
+    from app.services.interest_points_service import InterestPointsService
+    from app.services.notion_service import NotionService
+    from app.services.property_service import PropertyService
+    
+    for service_class in (NotionService, PropertyService, ScraperFactory,
+                          InterestPointsService, GeocodingService):
+        monkeypatch.setattr(service_class, "__init__", lambda self, *args, **kwargs: None)
+    return monkeypatch
+
+@pytest.fixture(scope="session")
+def here_service():
+    """Session-wide HereApiService for the live HERE integration tests"""
+    from app.config import config
+    from app.services.here_api_service import HereApiService
+    
+    if not config.HERE_API_KEY:
+        pytest.skip("HERE_API_KEY not set")
+    
+    service = HereApiService(config.HERE_API_KEY)
+    yield service
+    service.close()
+
+@pytest.fixture(scope="session")
+def interest_points_service():
+    """Session-wide InterestPointsService loaded from the project config"""
+    from app.config import config
+    from app.services.interest_points_service import InterestPointsService
+    
+    if not config.validate_here_api_config():
+        pytest.skip("HERE API not configured (set HERE_API_KEY and HERE_API_ENABLED=true)")
+    
+    config_path = Path(__file__).parent.parent / "config" / "interest_points_config.json"
+    service = InterestPointsService(str(config_path))
+    yield service
+    if service.here_service is not None:
+        service.here_service.close()
+
+@pytest.fixture(scope="session")
+def telegram_service():
+    """Session-wide TelegramService with spec-mocked dependencies, for tests that only read from it"""
+    from app.scrapers.scraper_factory import ScraperFactory
+    from app.services.geocoding_service import GeocodingService
+    from app.services.interest_points_service import InterestPointsService
+    from app.services.notion_service import NotionService
+    from app.services.property_service import PropertyService
+    from app.services.telegram_service import TelegramService
+    
+    return TelegramService(
+        bot_token="test_token",
+        notion_service=Mock(spec=NotionService),
+        property_service=Mock(spec=PropertyService),
+        scraper_factory=Mock(spec=ScraperFactory),
+        interest_points_service=Mock(spec=InterestPointsService),
+        geocoding_service=Mock(spec=GeocodingService)
+    )
+
+@pytest.fixture
+def fresh_telegram_service(telegram_service):
+    """Per-test copy of the shared TelegramService with its mutable state reset"""
+    service = copy.copy(telegram_service)
+    service.application = None
+    service.is_running = False
+    service._pending_buffers = {}
+    service._flush_tasks = set()
+    return service
+
+@pytest.fixture
+def mock_update(request):
+    """Mock Telegram update carrying a property URL, in the chat type given by the test's param"""
+    return SimpleNamespace(
+        message=SimpleNamespace(
+            text="https://www.daft.ie/property/123",
+            reply_text=AsyncMock(return_value=SimpleNamespace(edit_text=AsyncMock())),
+        ),
+        effective_user=SimpleNamespace(id=12345, username="testuser", first_name="Test"),
+        effective_chat=SimpleNamespace(id=12345, type=request.param),
+    )
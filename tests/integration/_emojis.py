@@ -0,0 +1,22 @@
+"""
+Transportation mode emojis shared by the integration check output
+"""
+
+from types import MappingProxyType
+
+from app.models.interest_points import TransportationMode
+
+# Read-only so one check cannot change what the others print
+TRANSPORT_EMOJIS = MappingProxyType({
+    TransportationMode.DRIVING: "🚗",
+    TransportationMode.WALKING: "🚶",
+    TransportationMode.PUBLIC_TRANSPORT: "🚌",
+    TransportationMode.BICYCLING: "🚲",
+    TransportationMode.TRUCK: "🚛",
+    TransportationMode.TAXI: "🚕",
+    TransportationMode.BUS: "🚌",
+    TransportationMode.TRAIN: "🚆",
+    TransportationMode.SUBWAY: "🚇",
+    TransportationMode.TRAM: "🚊",
+    TransportationMode.FERRY: "⛴️"
+})
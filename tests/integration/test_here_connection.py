@@ -5,21 +5,19 @@ Run this script to test if your HERE_API_KEY is properly configured and working.
 """
 
 import asyncio
-import aiohttp
-import os
-import sys
+import httpx
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Add the app directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
-
 from app.services.here_api_service import HereApiService
 from app.models.interest_points import TransportationMode
 from app.config import config
 
+# Bound every HERE request so a slow endpoint cannot hang the run
+TIMEOUT = httpx.Timeout(15.0, connect=5.0, read=10.0)
+
 async def test_here_api_connection():
     """Test HERE API connection with a simple distance calculation"""
     print("🔧 Testing HERE API Connection...")
@@ -97,7 +95,7 @@ async def test_here_api_connection():
         # Clean up - no async close needed for synchronous service
         pass
 
-async def test_here_api_direct_request():
+async def test_here_api_direct_request(client: httpx.AsyncClient):
     """Test HERE API with a direct HTTP request to verify the API key"""
     print(f"\n🔍 Testing HERE API with direct HTTP request...")
     print("=" * 50)
@@ -120,33 +118,31 @@ async def test_here_api_direct_request():
     }
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                print(f"   Status Code: {response.status}")
+        response = await client.get(url, params=params)
+        print(f"   Status Code: {response.status_code}")
+        
+        if response.status_code == 200:
+            data = response.json()
+            if "routes" in data and data["routes"]:
+                route = data["routes"][0]
+                summary = route.get("summary", {})
+                
+                distance_km = summary.get("length", 0) / 1000
+                duration_minutes = summary.get("duration", 0) / 60
+                
+                print(f"   ✅ Direct API call successful!")
+                print(f"   Distance: {distance_km:.2f} km")
+                print(f"   Duration: {duration_minutes:.0f} minutes")
+                return True
+            else:
+                print(f"   ⚠️  API returned no routes")
+                print(f"   Response: {data}")
+                return False
+        else:
+            print(f"   ❌ API call failed with status {response.status_code}")
+            print(f"   Error: {response.text}")
+            return False
                 
-                if response.status == 200:
-                    data = await response.json()
-                    if "routes" in data and data["routes"]:
-                        route = data["routes"][0]
-                        summary = route.get("summary", {})
-                        
-                        distance_km = summary.get("length", 0) / 1000
-                        duration_minutes = summary.get("duration", 0) / 60
-                        
-                        print(f"   ✅ Direct API call successful!")
-                        print(f"   Distance: {distance_km:.2f} km")
-                        print(f"   Duration: {duration_minutes:.0f} minutes")
-                        return True
-                    else:
-                        print(f"   ⚠️  API returned no routes")
-                        print(f"   Response: {data}")
-                        return False
-                else:
-                    error_text = await response.text()
-                    print(f"   ❌ API call failed with status {response.status}")
-                    print(f"   Error: {error_text}")
-                    return False
-                    
     except Exception as e:
         print(f"   ❌ Direct API call failed: {str(e)}")
         return False
@@ -156,11 +152,14 @@ async def main():
     print("🚀 HERE API Connection Test")
     print("=" * 50)
     
-    # Test 1: Service-based test
-    service_success = await test_here_api_connection()
-    
-    # Test 2: Direct API test
-    direct_success = await test_here_api_direct_request()
+    # One HTTP/2 client is shared by every direct HTTP check in this run
+    limits = httpx.Limits(max_keepalive_connections=8, max_connections=16)
+    async with httpx.AsyncClient(http2=True, timeout=TIMEOUT, limits=limits) as client:
+        # Test 1: Service-based test
+        service_success = await test_here_api_connection()
+        
+        # Test 2: Direct API test
+        direct_success = await test_here_api_direct_request(client)
     
     # Summary
     print(f"\n📊 Test Summary:")
@@ -0,0 +1,55 @@
+"""
+Live HERE API scenarios as a pytest suite
+
+These cover what the standalone HERE scripts check by hand, sharing one
+session-scoped service per run. They are skipped when the HERE API is not
+configured.
+"""
+
+import pytest
+
+from app.models.interest_points import TransportationMode
+
+# HERE rate-limits per key, so keep these cases on one xdist worker
+pytestmark = pytest.mark.xdist_group("here_api")
+
+# Dublin City Centre to the Indeed office
+ORIGIN = (53.3498, -6.2603)
+DESTINATION = (53.34549242723791, -6.231834356978687)
+
+
+def test_route_summary_returns_routes(here_service):
+    """Test that a direct driving route summary comes back with a route"""
+    result = here_service.get_route_summary(ORIGIN, DESTINATION, TransportationMode.DRIVING)
+    
+    assert result is not None
+    assert result.get("routes")
+
+
+@pytest.mark.parametrize("mode", [
+    TransportationMode.DRIVING,
+    TransportationMode.PUBLIC_TRANSPORT,
+    TransportationMode.WALKING,
+])
+async def test_prediction_time_by_mode(here_service, mode):
+    """Test next-Friday prediction times for each supported transport mode"""
+    result = await here_service.calculate_prediction_time(*ORIGIN, *DESTINATION, mode)
+    
+    assert result is not None
+    assert result["duration_minutes"] > 0
+    assert result["distance_km"] > 0
+    assert result["departure_time"]
+    assert result["arrival_time"]
+
+
+async def test_predictions_for_property(interest_points_service):
+    """Test that a property gets a prediction for every active interest point"""
+    active_ids = {point.id for point in interest_points_service.get_active_interest_points()}
+    
+    prediction_info = await interest_points_service.calculate_predictions_for_property(
+        *ORIGIN, "Dublin City Centre, Co. Dublin, Ireland"
+    )
+    
+    assert {prediction.destination_point_id for prediction in prediction_info.predictions} == active_ids
+    for prediction in prediction_info.predictions:
+        assert interest_points_service.get_interest_point_by_id(prediction.destination_point_id) is not None
@@ -4,30 +4,38 @@ Test script for interest points service with public transport
 """
 
 import asyncio
-import os
 import sys
 import time
+from operator import attrgetter
 from typing import List, Tuple
 
 # Load environment variables from .env file
 from dotenv import load_dotenv
 load_dotenv()
 
-# Add the app directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
-
 from app.services.interest_points_service import InterestPointsService
+from app.utils.formatting import format_km
+
+def _format_section(section: dict) -> str:
+    """Format one route section as an indented bullet line"""
+    section_type = section.get("type", "unknown")
+    duration = section.get("duration_minutes", 0)
+    if section_type == "transit":
+        mode = section.get("mode", "unknown")
+        name = section.get("name", "Unknown")
+        return f"        • {section_type}: {mode} {name} ({duration}min)"
+    return f"        • {section_type}: {duration}min"
 
-async def test_interest_points():
+async def test_interest_points(interest_points_service: InterestPointsService):
     """Test interest points service with public transport"""
     
     print("🏠 Testing Interest Points Service...")
     
-    # Initialize service
-    service = InterestPointsService()
+    service = interest_points_service
     
     # Get all interest points
     points = service.get_all_interest_points()
+    point_by_id = {point.id: point for point in points}
     print(f"📍 Loaded {len(points)} interest points:")
     
     for point in points:
@@ -58,78 +66,68 @@ async def test_interest_points():
         }
     ]
     
-    for location in test_locations:
+    active_ids = sorted(point.id for point in service.get_active_interest_points())
+    
+    # The locations are independent, so request all of them concurrently; errors propagate
+    start_time = time.time()
+    results = await asyncio.gather(*[
+        service.calculate_predictions_for_property(
+            location['lat'], location['lng'], location['address']
+        )
+        for location in test_locations
+    ])
+    calculation_time = time.time() - start_time
+    print(f"⏱️  Calculated predictions for {len(test_locations)} locations in {calculation_time:.2f}s")
+    print()
+    
+    for location, prediction_info in zip(test_locations, results):
         print(f"🚌 Testing prediction calculation for {location['name']}...")
         print(f"📍 Property location: {location['lat']}, {location['lng']}")
         
-        start_time = time.time()
+        # Every active point gets exactly one prediction; failed HERE calls are dropped, so they show up here
+        assert prediction_info is not None
+        assert sorted(prediction.destination_point_id for prediction in prediction_info.predictions) == active_ids
         
-        try:
-            prediction_info = await service.calculate_predictions_for_property(
-                location['lat'], location['lng'], location['address']
-            )
+        if prediction_info.predictions:
+            print(f"✅ Successfully calculated {len(prediction_info.predictions)} predictions")
+            print(f"📅 Prediction date: {prediction_info.prediction_date}")
+            print()
             
-            calculation_time = time.time() - start_time
+            # Sort predictions by duration
+            sorted_predictions = sorted(prediction_info.predictions, key=attrgetter('duration_minutes'))
             
-            if prediction_info and prediction_info.predictions:
-                print(f"✅ Successfully calculated {len(prediction_info.predictions)} predictions in {calculation_time:.2f}s")
-                print(f"📅 Prediction date: {prediction_info.prediction_date}")
-                print()
+            for i, prediction in enumerate(sorted_predictions, 1):
+                # Get destination point details
+                dest_point = point_by_id.get(prediction.destination_point_id)
+                dest_name = dest_point.name if dest_point else prediction.destination_point_id
                 
-                # Sort predictions by duration
-                sorted_predictions = sorted(prediction_info.predictions, key=lambda x: x.duration_minutes)
+                distance_display = format_km(prediction.distance_km)
                 
-                for i, prediction in enumerate(sorted_predictions, 1):
-                    # Get destination point details
-                    dest_point = service.get_interest_point_by_id(prediction.destination_point_id)
-                    dest_name = dest_point.name if dest_point else prediction.destination_point_id
-                    
-                    # Format distance with one decimal place (unless less than 1km)
-                    distance_display = f"{prediction.distance_km:.1f}km" if prediction.distance_km >= 1.0 else f"{prediction.distance_km:.3f}km"
-                    
-                    # Add walking distance information if available
-                    walking_info = ""
-                    if hasattr(prediction, 'total_walking_distance_km') and prediction.total_walking_distance_km > 0:
-                        walking_distance = prediction.total_walking_distance_km
-                        if walking_distance >= 1.0:
-                            walking_info = f" (🚶 {walking_distance:.1f}km walking)"
-                        else:
-                            walking_info = f" (🚶 {walking_distance:.3f}km walking)"
-                    elif prediction.route_details:
-                        # Fallback to route details for walking info
-                        total_walking = 0
-                        for section in prediction.route_details:
-                            if section.get("type") == "pedestrian":
-                                total_walking += section.get("duration_minutes", 0)
-                        if total_walking > 0:
-                            walking_info = f" (🚶 {total_walking}min walking)"
-                    
-                    print(f"  {i}. 🎯 To: {dest_name}")
-                    print(f"     🚌 Mode: {prediction.transportation_mode.value}")
-                    print(f"     ⏱️  Duration: {prediction.duration_minutes}min")
-                    print(f"     📏 Distance: {distance_display}{walking_info}")
-                    print(f"     🚀 Departure: {prediction.departure_time}")
-                    print(f"     🏁 Arrival: {prediction.arrival_time}")
-                    
-                    if prediction.route_details:
-                        print(f"     🛣️  Route details: {len(prediction.route_details)} sections")
-                        for section in prediction.route_details:
-                            section_type = section.get("type", "unknown")
-                            duration = section.get("duration_minutes", 0)
-                            if section_type == "transit":
-                                mode = section.get("mode", "unknown")
-                                name = section.get("name", "Unknown")
-                                print(f"        • {section_type}: {mode} {name} ({duration}min)")
-                            else:
-                                print(f"        • {section_type}: {duration}min")
-                    print()
-            else:
-                print("⚠️  No predictions calculated")
+                # Add walking distance information if available
+                walking_info = ""
+                if prediction.total_walking_distance_km:
+                    walking_info = f" (🚶 {format_km(prediction.total_walking_distance_km)} walking)"
+                elif prediction.total_walking_minutes:
+                    # Fallback to walking time for walking info
+                    walking_info = f" (🚶 {prediction.total_walking_minutes}min walking)"
                 
-        except Exception as e:
-            print(f"❌ Error calculating predictions: {e}")
-            import traceback
-            traceback.print_exc()
+                lines = [
+                    f"  {i}. 🎯 To: {dest_name}",
+                    f"     🚌 Mode: {prediction.transportation_mode.value}",
+                    f"     ⏱️  Duration: {prediction.duration_minutes}min",
+                    f"     📏 Distance: {distance_display}{walking_info}",
+                    f"     🚀 Departure: {prediction.departure_time}",
+                    f"     🏁 Arrival: {prediction.arrival_time}"
+                ]
+                
+                if prediction.route_details:
+                    lines.append(f"     🛣️  Route details: {len(prediction.route_details)} sections")
+                    lines.extend(_format_section(section) for section in prediction.route_details)
+                
+                # One write per prediction instead of one per line
+                sys.stdout.write("\n".join(lines) + "\n\n")
+        else:
+            print("⚠️  No predictions calculated")
         
         print("-" * 80)
     
@@ -139,6 +137,7 @@ async def test_interest_points():
     # Test by category
     transport_points = service.get_interest_points_by_category("transport")
     print(f"🚇 Transport points: {len(transport_points)}")
+    assert all(point.category == "transport" for point in transport_points)
     for point in transport_points:
         print(f"  • {point.name}")
     
@@ -146,12 +145,30 @@ async def test_interest_points():
     airport_point = service.get_interest_point_by_id("dublin_airport")
     if airport_point:
         print(f"✈️  Found airport: {airport_point.name} at {airport_point.latitude}, {airport_point.longitude}")
+        assert airport_point.id == "dublin_airport"
+    
+    # Test radius queries
+    nearby_points = service.get_interest_points_within(53.35, -6.26, 5)
+    print(f"📍 Points within 5km of Dublin City Centre: {len(nearby_points)}")
+    expected_nearby = {
+        point.id for point, distance in zip(points, service.distances_from(53.35, -6.26)) if distance <= 5
+    }
+    assert {point.id for point in nearby_points} == expected_nearby
     
     # Test active vs inactive
     active_points = service.get_active_interest_points()
     print(f"✅ Active points: {len(active_points)}")
+    assert active_points == [point for point in points if point.is_active]
     
     print("\n🎉 Interest Points Service test completed successfully!")
 
+async def _main():
+    """Run the check standalone with its own service"""
+    service = InterestPointsService()
+    try:
+        await test_interest_points(service)
+    finally:
+        await service.close()
+
 if __name__ == "__main__":
-    asyncio.run(test_interest_points()) 
\ No newline at end of file
+    asyncio.run(_main()) 
\ No newline at end of file
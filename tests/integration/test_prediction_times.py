@@ -5,23 +5,18 @@ This script tests the new prediction times feature for next Friday at 9am
 """
 
 import asyncio
-import sys
-import os
 from datetime import date
 
-# Add the app directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
-
 from app.services.interest_points_service import InterestPointsService
 from app.models.interest_points import TransportationMode
+from _emojis import TRANSPORT_EMOJIS
 
-async def test_prediction_times():
+async def test_prediction_times(interest_points_service: InterestPointsService):
     """Test the prediction times functionality"""
     print("🚗 Testing Prediction Times for Next Friday 9am")
     print("=" * 60)
     
-    # Initialize the service
-    service = InterestPointsService()
+    service = interest_points_service
     
     # Get active interest points
     active_points = service.get_active_interest_points()
@@ -29,9 +24,7 @@ async def test_prediction_times():
     for point in active_points:
         print(f"   • {point.name} ({point.default_transportation_mode.value})")
     
-    if not active_points:
-        print("❌ No active interest points found. Please configure some in interest_points_config.json")
-        return
+    assert active_points, "No active interest points found. Please configure some in interest_points_config.json"
     
     # Test coordinates (Dublin City Center)
     test_lat, test_lng = 53.3498, -6.2603
@@ -39,49 +32,38 @@ async def test_prediction_times():
     
     print(f"\n🏠 Testing predictions from: {test_address} ({test_lat}, {test_lng})")
     
-    try:
-        # Calculate predictions
-        prediction_info = await service.calculate_predictions_for_property(
-            test_lat, test_lng, test_address
-        )
+    print(f"\n⏳ Streaming predictions for {service._get_next_friday_9am()} as they complete:")
+    
+    # Resolve destination names from a dict built once up front
+    point_by_id = {point.id: point for point in service.get_all_interest_points()}
+    
+    predicted_ids = []
+    async for prediction in service.iter_predictions_for_property(test_lat, test_lng):
+        predicted_ids.append(prediction.destination_point_id)
+        interest_point = point_by_id.get(prediction.destination_point_id)
+        assert interest_point is not None, f"Prediction for unknown point {prediction.destination_point_id}"
         
-        if prediction_info and prediction_info.predictions:
-            print(f"\n✅ Successfully calculated {len(prediction_info.predictions)} predictions for {prediction_info.prediction_date}:")
-            
-            # Transportation mode emojis
-            transport_emojis = {
-                "DRIVING": "🚗",
-                "WALKING": "🚶",
-                "PUBLIC_TRANSPORT": "🚌",
-                "BICYCLING": "🚲",
-                "TRUCK": "🚛",
-                "TAXI": "🚕",
-                "BUS": "🚌",
-                "TRAIN": "🚆",
-                "SUBWAY": "🚇",
-                "TRAM": "🚊",
-                "FERRY": "⛴️"
-            }
-
-            for prediction in prediction_info.predictions:
-                point_name = prediction.destination_point_id
-                interest_point = service.get_interest_point_by_id(prediction.destination_point_id)
-                if interest_point:
-                    point_name = interest_point.name
-                
-                mode_emoji = transport_emojis.get(prediction.transportation_mode.value.upper(), "🚗")
-                
-                print(f"   {mode_emoji} {point_name}: {prediction.duration_minutes}min ({prediction.distance_km}km)")
-                print(f"      Depart: {prediction.departure_time} • Arrive: {prediction.arrival_time}")
-        else:
-            print("❌ No predictions calculated")
-            
-    except Exception as e:
-        print(f"❌ Error calculating predictions: {e}")
+        mode_emoji = TRANSPORT_EMOJIS.get(prediction.transportation_mode, "🚗")
+        
+        print(f"   {mode_emoji} {interest_point.name}: {prediction.duration_minutes}min ({prediction.distance_km}km)")
+        print(f"      Depart: {prediction.departure_time} • Arrive: {prediction.arrival_time}")
+        
+        assert prediction.transportation_mode == interest_point.default_transportation_mode
+        assert prediction.duration_minutes >= 0
+        assert prediction.distance_km >= 0
+        assert prediction.departure_time and prediction.arrival_time
     
+    # Every active point gets exactly one prediction; failed HERE calls are dropped, so they show up here
+    assert sorted(predicted_ids) == sorted(point.id for point in active_points)
+    print(f"\n✅ Successfully calculated {len(predicted_ids)} predictions")
+
+async def _main():
+    """Run the check standalone with its own service"""
+    service = InterestPointsService()
+    try:
+        await test_prediction_times(service)
     finally:
-        # Clean up
         await service.close()
 
 if __name__ == "__main__":
-    asyncio.run(test_prediction_times())
+    asyncio.run(_main())
@@ -5,23 +5,18 @@ This script tests the enhanced prediction times with route details
 """
 
 import asyncio
-import sys
-import os
 from datetime import date
 
-# Add the app directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
-
 from app.services.interest_points_service import InterestPointsService
 from app.models.interest_points import TransportationMode
+from _emojis import TRANSPORT_EMOJIS
 
-async def test_route_details():
+async def test_route_details(interest_points_service: InterestPointsService):
     """Test the route details functionality"""
     print("🚗 Testing Route Details for Next Friday 9am")
     print("=" * 60)
     
-    # Initialize the service
-    service = InterestPointsService()
+    service = interest_points_service
     
     # Get active interest points
     active_points = service.get_active_interest_points()
@@ -29,9 +24,7 @@ async def test_route_details():
     for point in active_points:
         print(f"   • {point.name} ({point.default_transportation_mode.value})")
     
-    if not active_points:
-        print("❌ No active interest points found. Please configure some in interest_points_config.json")
-        return
+    assert active_points, "No active interest points found. Please configure some in interest_points_config.json"
     
     # Test coordinates (Dublin City Center)
     test_lat, test_lng = 53.3498, -6.2603
@@ -39,67 +32,54 @@ async def test_route_details():
     
     print(f"\n🏠 Testing predictions from: {test_address} ({test_lat}, {test_lng})")
     
-    try:
-        # Calculate predictions
-        prediction_info = await service.calculate_predictions_for_property(
-            test_lat, test_lng, test_address
-        )
+    print(f"\n⏳ Streaming predictions for {service._get_next_friday_9am()} as they complete:")
+    
+    # Resolve destination names from a dict built once up front
+    point_by_id = {point.id: point for point in service.get_all_interest_points()}
+    
+    predicted_ids = []
+    async for prediction in service.iter_predictions_for_property(test_lat, test_lng):
+        predicted_ids.append(prediction.destination_point_id)
+        interest_point = point_by_id.get(prediction.destination_point_id)
+        assert interest_point is not None, f"Prediction for unknown point {prediction.destination_point_id}"
+        
+        mode_emoji = TRANSPORT_EMOJIS.get(prediction.transportation_mode, "🚗")
+        
+        print(f"\n   {mode_emoji} {interest_point.name}: {prediction.duration_minutes}min ({prediction.distance_km}km)")
+        print(f"      Depart: {prediction.departure_time} • Arrive: {prediction.arrival_time}")
         
-        if prediction_info and prediction_info.predictions:
-            print(f"\n✅ Successfully calculated {len(prediction_info.predictions)} predictions for {prediction_info.prediction_date}:")
+        # Display route details; they are a list of route sections
+        if prediction.route_details:
+            print(f"      Route: {prediction.route_summary}")
             
-            # Transportation mode emojis
-            transport_emojis = {
-                "DRIVING": "🚗",
-                "WALKING": "🚶",
-                "PUBLIC_TRANSPORT": "🚌",
-                "BICYCLING": "🚲",
-                "TRUCK": "🚛",
-                "TAXI": "🚕",
-                "BUS": "🚌",
-                "TRAIN": "🚆",
-                "SUBWAY": "🚇",
-                "TRAM": "🚊",
-                "FERRY": "⛴️"
-            }
-
-            for prediction in prediction_info.predictions:
-                point_name = prediction.destination_point_id
-                interest_point = service.get_interest_point_by_id(prediction.destination_point_id)
-                if interest_point:
-                    point_name = interest_point.name
-                
-                mode_emoji = transport_emojis.get(prediction.transportation_mode.value, "🚗")
-                
-                print(f"\n   {mode_emoji} {point_name}: {prediction.duration_minutes}min ({prediction.distance_km}km)")
-                print(f"      Depart: {prediction.departure_time} • Arrive: {prediction.arrival_time}")
-                
-                # Display route details
-                if prediction.route_details:
-                    route_details = prediction.route_details
-                    print(f"      Route: {prediction.route_summary}")
-                    
-                    if route_details.get("transport_legs"):
-                        print(f"      Transport legs:")
-                        for i, leg in enumerate(route_details["transport_legs"], 1):
-                            print(f"        {i}. {leg.get('line', 'Unknown')} ({leg['duration_minutes']}min)")
-                    
-                    total_walking = route_details.get("total_walking_minutes", 0)
-                    if total_walking > 0:
-                        print(f"      Walking: {total_walking}min ({route_details.get('total_walking_distance_km', 0):.1f}km)")
-                else:
-                    print(f"      Route: {prediction.route_summary or 'Direct route'}")
-        else:
-            print("❌ No predictions calculated")
+            transit_legs = [section for section in prediction.route_details if section.get("type") == "transit"]
+            if transit_legs:
+                print("      Transport legs:")
+                for i, leg in enumerate(transit_legs, 1):
+                    print(f"        {i}. {leg.get('line', 'Unknown')} ({leg['duration_minutes']}min)")
             
-    except Exception as e:
-        print(f"❌ Error calculating predictions: {e}")
-        import traceback
-        traceback.print_exc()
+            if prediction.total_walking_minutes:
+                print(f"      Walking: {prediction.total_walking_minutes}min ({prediction.total_walking_distance_km or 0:.1f}km)")
+            
+            for section in prediction.route_details:
+                assert section.get("type"), f"Route section without a type: {section}"
+                assert section["duration_minutes"] >= 0
+                assert section["distance_m"] >= 0
+            assert sum(section["duration_minutes"] for section in prediction.route_details) <= prediction.duration_minutes
+        else:
+            print(f"      Route: {prediction.route_summary or 'Direct route'}")
     
+    # Every active point gets exactly one prediction; failed HERE calls are dropped, so they show up here
+    assert sorted(predicted_ids) == sorted(point.id for point in active_points)
+    print(f"\n✅ Successfully calculated {len(predicted_ids)} predictions")
+
+async def _main():
+    """Run the check standalone with its own service"""
+    service = InterestPointsService()
+    try:
+        await test_route_details(service)
     finally:
-        # Clean up
         await service.close()
 
 if __name__ == "__main__":
-    asyncio.run(test_route_details())
+    asyncio.run(_main())
@@ -0,0 +1,14 @@
+import pytest
+from app.utils.formatting import format_km
+
+
+@pytest.mark.parametrize("km,expected", [
+    (12.345, "12.3km"),
+    (1.0, "1.0km"),
+    (0.9996, "1.000km"),
+    (0.25, "0.250km"),
+    (0.0, "0.000km"),
+])
+def test_format_km(km, expected):
+    """Test one decimal place from 1km up and three below"""
+    assert format_km(km) == expected
@@ -0,0 +1,140 @@
+import math
+import pytest
+from pathlib import Path
+from app.models.interest_points import InterestPoint
+from app.services.interest_points_service import InterestPointsService
+
+FIXTURE_CONFIG = Path(__file__).parent / "fixtures" / "interest_points_config.json"
+
+
+def _brute_force_haversine_km(lat1, lng1, lat2, lng2):
+    """Reference great-circle distance, computed independently of the service"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = math.radians(lat2 - lat1)
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * 6371.0088 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+@pytest.fixture
+def service():
+    """Interest points service loaded from the small offline fixture file"""
+    return InterestPointsService(str(FIXTURE_CONFIG))
+
+
+class TestInterestPointsWithin:
+    """Test cases for radius queries on interest points"""
+    
+    @pytest.mark.parametrize("latitude,longitude,radius_km", [
+        (53.3498, -6.2603, 0.5),
+        (53.3498, -6.2603, 2),
+        (53.3498, -6.2603, 5),
+        (53.3498, -6.2603, 10),
+        (53.3498, -6.2603, 25),
+        (53.30, -6.15, 8),
+        (51.90, -8.47, 5),
+    ])
+    def test_matches_brute_force_haversine(self, service, latitude, longitude, radius_km):
+        """Test that the indexed query returns exactly the points a full haversine scan finds"""
+        expected = {
+            point.id for point in service.get_all_interest_points()
+            if _brute_force_haversine_km(latitude, longitude, point.latitude, point.longitude) <= radius_km
+        }
+        
+        result = service.get_interest_points_within(latitude, longitude, radius_km)
+        
+        assert {point.id for point in result} == expected
+        assert len(result) == len(expected)
+    
+    def test_excludes_points_in_the_box_corner(self, service):
+        """Test that a point inside the bounding box but outside the radius is not returned"""
+        ids = {point.id for point in service.get_interest_points_within(53.3498, -6.2603, 5)}
+        
+        assert "box_corner" not in ids
+        assert {"city_centre", "grafton_street", "ringsend"} <= ids
+    
+    def test_latitude_index_is_sorted(self, service):
+        """Test that the index lists every point in latitude order"""
+        latitudes, ordered = service._get_latitude_index()
+        
+        assert latitudes == sorted(latitudes)
+        assert latitudes == [point.latitude for point in ordered]
+        assert {point.id for point in ordered} == {point.id for point in service.get_all_interest_points()}
+    
+    def test_index_is_rebuilt_after_add(self, service):
+        """Test that an added point is found by the next query"""
+        service.get_interest_points_within(53.3498, -6.2603, 1)
+        assert service._latitude_index is not None
+        
+        assert service.add_interest_point(InterestPoint(
+            id="trinity", name="Trinity College", category="education",
+            latitude=53.3438, longitude=-6.2546
+        ))
+        assert service._latitude_index is None
+        
+        ids = {point.id for point in service.get_interest_points_within(53.3498, -6.2603, 1)}
+        assert "trinity" in ids
+        assert len(service._get_latitude_index()[1]) == len(service.get_all_interest_points())
+    
+    def test_index_is_rebuilt_after_update(self, service):
+        """Test that a moved point is found at its new location only"""
+        service.get_interest_points_within(53.3498, -6.2603, 1)
+        
+        assert service.update_interest_point("bray", {"latitude": 53.3500, "longitude": -6.2600})
+        assert service._latitude_index is None
+        
+        assert "bray" in {point.id for point in service.get_interest_points_within(53.3498, -6.2603, 1)}
+        assert "bray" not in {point.id for point in service.get_interest_points_within(53.2028, -6.0983, 1)}
+    
+    def test_index_is_rebuilt_after_delete(self, service):
+        """Test that a deleted point is no longer returned"""
+        assert "grafton_street" in {point.id for point in service.get_interest_points_within(53.3498, -6.2603, 2)}
+        
+        assert service.delete_interest_point("grafton_street")
+        assert service._latitude_index is None
+        
+        assert "grafton_street" not in {point.id for point in service.get_interest_points_within(53.3498, -6.2603, 2)}
+        assert len(service._get_latitude_index()[1]) == len(service.get_all_interest_points())
+    
+    def test_radian_coords_are_rebuilt_after_changes(self, service):
+        """Test that distances reflect points added, moved and deleted since the last call"""
+        service.distances_from(53.3498, -6.2603)
+        assert service._radian_coords is not None
+        
+        service.add_interest_point(InterestPoint(
+            id="trinity", name="Trinity College", category="education",
+            latitude=53.3438, longitude=-6.2546
+        ))
+        assert service._radian_coords is None
+        assert len(service.distances_from(53.3498, -6.2603)) == len(service.get_all_interest_points())
+        
+        service.update_interest_point("bray", {"latitude": 53.3498, "longitude": -6.2603})
+        assert service._radian_coords is None
+        ids = [point.id for point in service.get_all_interest_points()]
+        assert service.distances_from(53.3498, -6.2603)[ids.index("bray")] == pytest.approx(0.0, abs=1e-9)
+        
+        service.delete_interest_point("trinity")
+        assert service._radian_coords is None
+        assert len(service.distances_from(53.3498, -6.2603)) == len(service.get_all_interest_points())
+
+
+class TestInterestPointsDistancesFrom:
+    """Test cases for bulk great-circle distances to interest points"""
+    
+    def test_matches_brute_force_haversine_in_list_order(self, service):
+        """Test that every distance matches the reference formula, in point order"""
+        distances = service.distances_from(53.30, -6.15)
+        points = service.get_all_interest_points()
+        
+        assert len(distances) == len(points)
+        for point, distance in zip(points, distances):
+            expected = _brute_force_haversine_km(53.30, -6.15, point.latitude, point.longitude)
+            assert distance == pytest.approx(expected, rel=1e-9)
+    
+    def test_known_distance(self, service):
+        """Test the distance from the city centre to Bray against a known value"""
+        ids = [point.id for point in service.get_all_interest_points()]
+        distances = service.distances_from(53.3498, -6.2603)
+        
+        assert distances[ids.index("city_centre")] == pytest.approx(0.0, abs=1e-9)
+        assert distances[ids.index("bray")] == pytest.approx(19.6, abs=0.1)
@@ -6,124 +6,165 @@ Test script for Notion integration endpoints
 import asyncio
 import aiohttp
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 # API base URL
 BASE_URL = "http://localhost:8000"
 
-async def test_notion_endpoints():
-    """Test all Notion integration endpoints"""
+# How often and how many times to poll a background batch save job
+JOB_POLL_INTERVAL = 0.5
+JOB_POLL_ATTEMPTS = 60
+
+def _new_session() -> aiohttp.ClientSession:
+    """Pooled keep-alive session for talking to the local API"""
+    return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=30))
+
+async def _error_lines(label: str, response: aiohttp.ClientResponse) -> List[str]:
+    """Describe a failed API response"""
+    error_data = await response.json()
+    return [
+        f"❌ {label} failed: {response.status}",
+        f"   Error: {error_data.get('detail', 'Unknown error')}"
+    ]
+
+async def _check_database(session: aiohttp.ClientSession) -> List[str]:
+    """Test 1: Check database accessibility"""
+    lines = ["\n1. Testing database accessibility..."]
+    try:
+        async with session.get(f"{BASE_URL}/notion/database/check") as response:
+            if response.status == 200:
+                data = await response.json()
+                lines.append(f"✅ Database check: {data['message']}")
+            else:
+                lines.extend(await _error_lines("Database check", response))
+    except Exception as e:
+        lines.append(f"❌ Database check error: {e}")
+    return lines
+
+async def _get_database_info(session: aiohttp.ClientSession) -> List[str]:
+    """Test 2: Get database information"""
+    lines = ["\n2. Getting database information..."]
+    try:
+        async with session.get(f"{BASE_URL}/notion/database/info") as response:
+            if response.status == 200:
+                data = await response.json()
+                lines.extend([
+                    f"✅ Database info retrieved:",
+                    f"   Title: {data.get('database_title', 'N/A')}",
+                    f"   ID: {data.get('database_id', 'N/A')}",
+                    f"   URL: {data.get('database_url', 'N/A')}",
+                    f"   Properties: {', '.join(data.get('properties', []))}"
+                ])
+            else:
+                lines.extend(await _error_lines("Database info", response))
+    except Exception as e:
+        lines.append(f"❌ Database info error: {e}")
+    return lines
+
+async def _ingest_and_save(session: aiohttp.ClientSession) -> List[str]:
+    """Test 3: Ingest and save a property from URL"""
+    lines = ["\n3. Testing property ingestion and Notion save..."]
+    test_url = "https://www.daft.ie/property/example"  # Replace with real URL
     
-    async with aiohttp.ClientSession() as session:
-        print("🏠 Testing HouseHunter Notion Integration")
-        print("=" * 50)
-        
-        # Test 1: Check database accessibility
-        print("\n1. Testing database accessibility...")
-        try:
-            async with session.get(f"{BASE_URL}/notion/database/check") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print(f"✅ Database check: {data['message']}")
-                else:
-                    print(f"❌ Database check failed: {response.status}")
-                    error_data = await response.json()
-                    print(f"   Error: {error_data.get('detail', 'Unknown error')}")
-        except Exception as e:
-            print(f"❌ Database check error: {e}")
-        
-        # Test 2: Get database information
-        print("\n2. Getting database information...")
-        try:
-            async with session.get(f"{BASE_URL}/notion/database/info") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print(f"✅ Database info retrieved:")
-                    print(f"   Title: {data.get('database_title', 'N/A')}")
-                    print(f"   ID: {data.get('database_id', 'N/A')}")
-                    print(f"   URL: {data.get('database_url', 'N/A')}")
-                    print(f"   Properties: {', '.join(data.get('properties', []))}")
-                else:
-                    print(f"❌ Database info failed: {response.status}")
-                    error_data = await response.json()
-                    print(f"   Error: {error_data.get('detail', 'Unknown error')}")
-        except Exception as e:
-            print(f"❌ Database info error: {e}")
-        
-        # Test 3: Ingest and save a property from URL
-        print("\n3. Testing property ingestion and Notion save...")
-        test_url = "https://www.daft.ie/property/example"  # Replace with real URL
-        
-        try:
-            payload = {"url": test_url}
-            async with session.post(
-                f"{BASE_URL}/notion/properties/ingest-and-save",
-                json=payload
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print(f"✅ Property ingested and saved to Notion:")
-                    print(f"   Property ID: {data.get('property', {}).get('id', 'N/A')}")
-                    print(f"   Notion Page ID: {data.get('notion_result', {}).get('notion_page_id', 'N/A')}")
-                    print(f"   Notion URL: {data.get('notion_result', {}).get('notion_page_url', 'N/A')}")
-                else:
-                    print(f"❌ Property ingestion failed: {response.status}")
-                    error_data = await response.json()
-                    print(f"   Error: {error_data.get('detail', 'Unknown error')}")
-        except Exception as e:
-            print(f"❌ Property ingestion error: {e}")
+    try:
+        payload = {"url": test_url}
+        async with session.post(
+            f"{BASE_URL}/notion/properties/ingest-and-save",
+            json=payload
+        ) as response:
+            if response.status == 200:
+                data = await response.json()
+                lines.extend([
+                    f"✅ Property ingested and saved to Notion:",
+                    f"   Property ID: {data.get('property', {}).get('id', 'N/A')}",
+                    f"   Notion Page ID: {data.get('notion_result', {}).get('notion_page_id', 'N/A')}",
+                    f"   Notion URL: {data.get('notion_result', {}).get('notion_page_url', 'N/A')}"
+                ])
+            else:
+                lines.extend(await _error_lines("Property ingestion", response))
+    except Exception as e:
+        lines.append(f"❌ Property ingestion error: {e}")
+    return lines
+
+async def _batch_save(session: aiohttp.ClientSession) -> List[str]:
+    """Test 4: Batch save properties (if you have existing properties)"""
+    lines = ["\n4. Testing batch save..."]
+    try:
+        # This would require existing property IDs
+        payload = {"property_ids": ["test_id_1", "test_id_2"]}
+        async with session.post(
+            f"{BASE_URL}/notion/properties/batch-save",
+            json=payload
+        ) as response:
+            if response.status != 202:
+                lines.extend(await _error_lines("Batch save", response))
+                return lines
+            data = await response.json()
+        lines.append(f"⏳ Batch save job started: {data['job_id']}")
         
-        # Test 4: Batch save properties (if you have existing properties)
-        print("\n4. Testing batch save...")
-        try:
-            # This would require existing property IDs
-            payload = {"property_ids": ["test_id_1", "test_id_2"]}
-            async with session.post(
-                f"{BASE_URL}/notion/properties/batch-save",
-                json=payload
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print(f"✅ Batch save completed:")
-                    print(f"   Total: {data.get('total_properties', 0)}")
-                    print(f"   Successful: {data.get('successful', 0)}")
-                    print(f"   Failed: {data.get('failed', 0)}")
-                else:
-                    print(f"❌ Batch save failed: {response.status}")
-                    error_data = await response.json()
-                    print(f"   Error: {error_data.get('detail', 'Unknown error')}")
-        except Exception as e:
-            print(f"❌ Batch save error: {e}")
+        # The save runs in the background, so poll the job until it finishes
+        for _ in range(JOB_POLL_ATTEMPTS):
+            if data.get("status") not in ("pending", "running"):
+                break
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+            async with session.get(f"{BASE_URL}/notion/jobs/{data['job_id']}") as response:
+                data = await response.json()
         
-        print("\n" + "=" * 50)
-        print("🏁 Notion integration tests completed!")
+        if data.get("status") == "done":
+            lines.extend([
+                f"✅ Batch save completed:",
+                f"   Total: {data.get('total_properties', 0)}",
+                f"   Successful: {data.get('successful', 0)}",
+                f"   Failed: {data.get('failed', 0)}"
+            ])
+        else:
+            lines.append(f"❌ Batch save did not finish: {data.get('status')} {data.get('error', '')}".rstrip())
+    except Exception as e:
+        lines.append(f"❌ Batch save error: {e}")
+    return lines
 
-async def test_with_real_data():
-    """Test with a real property URL (replace with actual URL)"""
+async def test_notion_endpoints(session: aiohttp.ClientSession):
+    """Test all Notion integration endpoints"""
+    print("🏠 Testing HouseHunter Notion Integration")
+    print("=" * 50)
+    
+    # None of the calls depend on each other, so run them concurrently
+    results = await asyncio.gather(
+        _check_database(session),
+        _get_database_info(session),
+        _ingest_and_save(session),
+        _batch_save(session)
+    )
+    for lines in results:
+        print("\n".join(lines))
     
+    print("\n" + "=" * 50)
+    print("🏁 Notion integration tests completed!")
+
+async def test_with_real_data(session: aiohttp.ClientSession):
+    """Test with a real property URL (replace with actual URL)"""
     # Example: Replace this with a real Daft.ie property URL
     real_property_url = "https://www.daft.ie/property/example"
     
     print(f"\n🔗 Testing with real property URL: {real_property_url}")
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            payload = {"url": real_property_url}
-            async with session.post(
-                f"{BASE_URL}/notion/properties/ingest-and-save",
-                json=payload
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print("✅ Success! Property saved to Notion")
-                    print(f"   Property: {data.get('property', {}).get('address', {}).get('street', 'N/A')}")
-                    print(f"   Notion Page: {data.get('notion_result', {}).get('notion_page_url', 'N/A')}")
-                else:
-                    print(f"❌ Failed: {response.status}")
-                    error_data = await response.json()
-                    print(f"   Error: {error_data.get('detail', 'Unknown error')}")
-        except Exception as e:
-            print(f"❌ Error: {e}")
+    try:
+        payload = {"url": real_property_url}
+        async with session.post(
+            f"{BASE_URL}/notion/properties/ingest-and-save",
+            json=payload
+        ) as response:
+            if response.status == 200:
+                data = await response.json()
+                print("✅ Success! Property saved to Notion")
+                print(f"   Property: {data.get('property', {}).get('address', {}).get('street', 'N/A')}")
+                print(f"   Notion Page: {data.get('notion_result', {}).get('notion_page_url', 'N/A')}")
+            else:
+                print(f"❌ Failed: {response.status}")
+                error_data = await response.json()
+                print(f"   Error: {error_data.get('detail', 'Unknown error')}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
 
 def print_usage_examples():
     """Print usage examples for the Notion integration"""
@@ -151,17 +192,22 @@ def print_usage_examples():
     print("   curl -X POST http://localhost:8000/notion/properties/batch-save \\")
     print("        -H 'Content-Type: application/json' \\")
     print("        -d '{\"property_ids\": [\"id1\", \"id2\", \"id3\"]}'")
+    print("   curl http://localhost:8000/notion/jobs/<job_id>  # poll until status is done")
+
+async def main(with_real_data: bool = False):
+    """Run the endpoint checks over one session shared by every test"""
+    async with _new_session() as session:
+        await test_notion_endpoints(session)
+        if with_real_data:
+            await test_with_real_data(session)
 
 if __name__ == "__main__":
     print("🚀 HouseHunter Notion Integration Test Script")
     print("Make sure the API is running on http://localhost:8000")
     print("Make sure NOTION_TOKEN and NOTION_DATABASE_ID are set")
     
-    # Run basic tests
-    asyncio.run(test_notion_endpoints())
+    # Run basic tests (pass with_real_data=True to also test with a real property URL)
+    asyncio.run(main())
     
     # Print usage examples
-    print_usage_examples()
-    
-    # Uncomment the line below to test with a real property URL
-    # asyncio.run(test_with_real_data()) 
\ No newline at end of file
+    print_usage_examples() 
\ No newline at end of file
@@ -0,0 +1,42 @@
+import time
+import pytest
+from unittest.mock import Mock
+from fastapi import HTTPException
+from app.api.routes import notion_routes
+from app.services.notion_service import NotionService
+from app.services.property_service import PropertyService
+
+
+@pytest.fixture
+def batch_jobs(monkeypatch):
+    """Empty batch job registry for the duration of one test"""
+    monkeypatch.setattr(notion_routes, "_batch_jobs", {})
+    monkeypatch.setattr(notion_routes, "_job_finished_at", {})
+    return notion_routes._batch_jobs
+
+
+async def test_run_batch_save_records_finish_time(batch_jobs):
+    """Test that a finished job is registered for later eviction"""
+    batch_jobs["job"] = {"job_id": "job", "status": "pending", "total_properties": 0}
+    
+    await notion_routes._run_batch_save("job", [], Mock(spec=NotionService), Mock(spec=PropertyService))
+    
+    assert batch_jobs["job"]["status"] == "done"
+    assert "job" in notion_routes._job_finished_at
+
+
+async def test_finished_jobs_are_evicted_after_ttl(batch_jobs):
+    """Test that only jobs finished longer than the TTL ago are dropped"""
+    now = time.monotonic()
+    batch_jobs.update(old={"status": "done"}, recent={"status": "done"}, running={"status": "running"})
+    notion_routes._job_finished_at.update(
+        old=now - notion_routes._FINISHED_JOB_TTL - 1,
+        recent=now - 1
+    )
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await notion_routes.get_batch_save_job("old")
+    
+    assert exc_info.value.status_code == 404
+    assert set(batch_jobs) == {"recent", "running"}
+    assert set(notion_routes._job_finished_at) == {"recent"}
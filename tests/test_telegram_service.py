@@ -1,201 +1,333 @@
+import asyncio
 import pytest
-import os
-from unittest.mock import Mock, patch
-from app.services.telegram_service import TelegramService
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+from telegram.error import BadRequest
+from app.services.telegram_service import TelegramService, _iter_chunks, _md_escape
 from app.services.notion_service import NotionService
 from app.services.property_service import PropertyService
 from app.scrapers.scraper_factory import ScraperFactory
 
-class TestTelegramService:
-    """Test cases for TelegramService"""
-    
-    def test_telegram_service_initialization_with_token(self):
-        """Test TelegramService initialization with provided token"""
-        mock_notion_service = Mock(spec=NotionService)
-        mock_property_service = Mock(spec=PropertyService)
-        mock_scraper_factory = Mock(spec=ScraperFactory)
-        
-        service = TelegramService(
-            bot_token="123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
-            notion_service=mock_notion_service,
-            property_service=mock_property_service,
-            scraper_factory=mock_scraper_factory
+# The Daft listing URL that previously failed URL detection
+DAFT_URL = "https://www.daft.ie/for-sale/house-18-rosan-glas-rahoon-co-galway/6231936"
+
+# (text, contains a URL) rows for _is_url
+URL_CASES = (
+    ("https://www.daft.ie/property/123", True),
+    ("http://example.com/page", True),
+    ("Check this out: https://www.daft.ie/property/123", True),
+    (DAFT_URL, True),
+    ("Just some text", False),
+    ("www.example.com", False),  # No protocol
+    ("not a url at all", False),
+)
+
+# (text, URLs it contains) rows for _extract_urls
+EXTRACT_CASES = (
+    ("Check out this property: https://www.daft.ie/property/123 and also this one http://example.com/test",
+     frozenset({"https://www.daft.ie/property/123", "http://example.com/test"})),
+    (DAFT_URL, frozenset({DAFT_URL})),
+)
+
+# Stand-in scraper list for bot info, which only reports how many scrapers there are
+_SINGLE_SCRAPER = [object()]
+
+@pytest.fixture(scope="session")
+def mock_notion():
+    """NotionService spec mock, built once since tests only compare it by identity"""
+    return Mock(spec=NotionService)
+
+@pytest.fixture(scope="session")
+def mock_property():
+    """PropertyService spec mock, built once since tests only compare it by identity"""
+    return Mock(spec=PropertyService)
+
+@pytest.fixture(scope="session")
+def mock_scraper():
+    """ScraperFactory spec mock, built once since tests only compare it by identity"""
+    return Mock(spec=ScraperFactory)
+
+@pytest.fixture(scope="module")
+def bot_info_service():
+    """TelegramService wired to configured Notion and scraper mocks, built once per module"""
+    mock_notion_service = Mock()
+    mock_notion_service.notion_token = "test_notion_token"
+    mock_notion_service.database_id = "test_database_id"
+    
+    mock_scraper_factory = Mock()
+    mock_scraper_factory.get_supported_websites.return_value = ["daft.ie"]
+    mock_scraper_factory.scrapers = _SINGLE_SCRAPER
+    
+    return TelegramService(
+        bot_token="test_token",
+        notion_service=mock_notion_service,
+        scraper_factory=mock_scraper_factory
+    )
+
+@pytest.fixture
+def application_mock(mocker):
+    """Mock Application returned by the patched Application.builder() chain"""
+    mock_app = Mock()
+    mock_app.initialize = AsyncMock()
+    mock_app.start = AsyncMock()
+    mock_app.updater = Mock()
+    mock_app.updater.start_polling = AsyncMock()
+    
+    app_class = mocker.patch('app.services.telegram_service.Application')
+    app_class.configure_mock(**{"builder.return_value.token.return_value.build.return_value": mock_app})
+    return mock_app
+
+
+def test_telegram_service_initialization_with_token(mock_notion, mock_property, mock_scraper):
+    """Test TelegramService initialization with provided token"""
+    service = TelegramService(
+        bot_token="123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
+        notion_service=mock_notion,
+        property_service=mock_property,
+        scraper_factory=mock_scraper
+    )
+    
+    assert service.bot_token == "123456789:ABCdefGHIjklMNOpqrsTUVwxyz"
+    assert service.notion_service is mock_notion
+    assert service.property_service is mock_property
+    assert service.scraper_factory is mock_scraper
+    assert not service.is_running
+    assert service.application is None
+
+
+def test_telegram_service_initialization_without_token_raises_error(empty_telegram_env):
+    """Test TelegramService initialization without token raises ValueError"""
+    with pytest.raises(ValueError, match="Telegram bot token is required"):
+        TelegramService()
+
+
+def test_telegram_service_initialization_with_env_token(telegram_token_env, fast_services):
+    """Test TelegramService initialization using environment variable"""
+    service = TelegramService()
+    assert service.bot_token == "test_token"
+    assert isinstance(service.notion_service, NotionService)
+    assert isinstance(service.property_service, PropertyService)
+    assert isinstance(service.scraper_factory, ScraperFactory)
+
+
+@pytest.mark.parametrize("text,expected", URL_CASES)
+def test_is_url_detection(telegram_service, text, expected):
+    """Test URL detection functionality"""
+    assert telegram_service._is_url(text) is expected
+
+
+@pytest.mark.parametrize("text,expected", EXTRACT_CASES)
+def test_extract_urls(telegram_service, text, expected):
+    """Test URL extraction from text"""
+    urls = telegram_service._extract_urls(text)
+    
+    assert len(urls) == len(expected)
+    assert set(urls) == expected
+
+
+def test_split_message_short_message_unchanged(telegram_service):
+    """Test that messages under the limit are returned as a single part"""
+    assert telegram_service._split_message("line 1\nline 2", max_length=50) == ["line 1\nline 2"]
+
+
+def test_split_message_splits_on_line_breaks(telegram_service):
+    """Test that long messages are split at line boundaries within the limit"""
+    message = "\n".join(f"line {i:02d}" for i in range(10))
+    parts = telegram_service._split_message(message, max_length=20)
+
+    assert all(len(part) <= 20 for part in parts)
+    assert "\n".join(parts) == message
+
+
+def test_split_message_hard_cuts_long_lines(telegram_service):
+    """Test that a single line longer than the limit is cut without losing text"""
+    parts = telegram_service._split_message("x" * 25, max_length=10)
+
+    assert parts == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_split_message_accepts_fragments(telegram_service):
+    """Test that message fragments are packed without joining them first"""
+    parts = telegram_service._split_message(["line 1\n", "line 2\n", "line 3\n"], max_length=14)
+    
+    assert parts == ["line 1\nline 2", "line 3"]
+
+
+def test_iter_chunks_keeps_parts_whole():
+    """Test that message parts are packed greedily without being split"""
+    parts = ["aaaa\n", "bbbb\n", "cccc\n"]
+    
+    assert list(_iter_chunks(parts, limit=10)) == ["aaaa\nbbbb", "cccc"]
+
+
+def test_md_escape_escapes_markdown_entities():
+    """Test that dynamic values cannot open stray Markdown entities"""
+    assert _md_escape("👤 @john_doe: ") == "👤 @john\\_doe: "
+    assert _md_escape("*Main* [Street] `x`") == "\\*Main\\* \\[Street] \\`x\\`"
+
+
+def test_get_bot_info(bot_info_service):
+    """Test get_bot_info method"""
+    bot_info = bot_info_service.get_bot_info()
+    
+    assert bot_info["is_running"] is False
+    assert bot_info["bot_token_configured"] is True
+    assert bot_info["notion_configured"] is True
+    assert bot_info["supported_websites"] == ["daft.ie"]
+    assert bot_info["scraper_count"] == 1
+
+
+async def test_start_bot_updates_running_status(fresh_telegram_service, application_mock):
+    """Test that start_bot method properly updates running status"""
+    await fresh_telegram_service.start_bot()
+    
+    assert fresh_telegram_service.is_running is True
+    application_mock.updater.start_polling.assert_awaited_once()
+
+
+async def test_stop_bot_updates_running_status(fresh_telegram_service):
+    """Test that stop_bot method properly updates running status"""
+    fresh_telegram_service.is_running = True
+    
+    # Mock the application
+    mock_app = Mock()
+    mock_app.updater = Mock()
+    mock_app.updater.stop = AsyncMock()
+    mock_app.stop = AsyncMock()
+    mock_app.shutdown = AsyncMock()
+    fresh_telegram_service.application = mock_app
+    
+    await fresh_telegram_service.stop_bot()
+    
+    assert fresh_telegram_service.is_running is False
+    mock_app.shutdown.assert_awaited_once()
+
+
+@pytest.mark.parametrize("mock_update", ["group", "private"], indirect=True)
+async def test_message_handling(fresh_telegram_service, mocker, mock_update):
+    """Test that bot passes the URL and username on in both group and private chats"""
+    # Mock the URL processing to avoid actual scraping
+    mock_process = mocker.patch.object(fresh_telegram_service, '_process_property_url')
+    await fresh_telegram_service.handle_message(mock_update, Mock())
+    
+    # Verify that the message was processed with the update, URL, and username
+    mock_process.assert_called_once_with(mock_update, "https://www.daft.ie/property/123", "testuser")
+
+
+async def test_split_long_message_is_processed_once(fresh_telegram_service, mocker):
+    """Test that a long message split by Telegram is buffered and processed as one"""
+    first_chunk = "https://www.daft.ie/property/123 " + "x" * 4000
+    second_chunk = "more text"
+    
+    def make_update(text):
+        return SimpleNamespace(
+            message=SimpleNamespace(text=text),
+            effective_chat=SimpleNamespace(id=42),
+            effective_user=SimpleNamespace(id=7),
         )
-        
-        assert service.bot_token == "123456789:ABCdefGHIjklMNOpqrsTUVwxyz"
-        assert service.notion_service == mock_notion_service
-        assert service.property_service == mock_property_service
-        assert service.scraper_factory == mock_scraper_factory
-        assert not service.is_running
-        assert service.application is None
-    
-    def test_telegram_service_initialization_without_token_raises_error(self):
-        """Test TelegramService initialization without token raises ValueError"""
-        with patch.dict(os.environ, {}, clear=True):
-            with pytest.raises(ValueError, match="Telegram bot token is required"):
-                TelegramService()
-    
-    @patch.dict(os.environ, {"TELEGRAM_BOT_TOKEN": "test_token"})
-    def test_telegram_service_initialization_with_env_token(self):
-        """Test TelegramService initialization using environment variable"""
-        service = TelegramService()
-        assert service.bot_token == "test_token"
-        assert isinstance(service.notion_service, NotionService)
-        assert isinstance(service.property_service, PropertyService)
-        assert isinstance(service.scraper_factory, ScraperFactory)
-    
-    def test_is_url_detection(self):
-        """Test URL detection functionality"""
-        service = TelegramService(bot_token="test_token")
-        
-        # Valid URLs
-        assert service._is_url("https://www.daft.ie/property/123")
-        assert service._is_url("http://example.com/page")
-        assert service._is_url("Check this out: https://www.daft.ie/property/123")
-        assert service._is_url("https://www.daft.ie/for-sale/house-18-rosan-glas-rahoon-co-galway/6231936")
-        
-        # Invalid URLs
-        assert not service._is_url("Just some text")
-        assert not service._is_url("www.example.com")  # No protocol
-        assert not service._is_url("not a url at all")
-    
-    def test_extract_urls(self):
-        """Test URL extraction from text"""
-        service = TelegramService(bot_token="test_token")
-        
-        text = "Check out this property: https://www.daft.ie/property/123 and also this one http://example.com/test"
-        urls = service._extract_urls(text)
-        
-        assert len(urls) == 2
-        assert "https://www.daft.ie/property/123" in urls
-        assert "http://example.com/test" in urls
-        
-        # Test with the specific Daft URL that was failing
-        daft_text = "https://www.daft.ie/for-sale/house-18-rosan-glas-rahoon-co-galway/6231936"
-        daft_urls = service._extract_urls(daft_text)
-        
-        assert len(daft_urls) == 1
-        assert "https://www.daft.ie/for-sale/house-18-rosan-glas-rahoon-co-galway/6231936" in daft_urls
-    
-    def test_get_bot_info(self):
-        """Test get_bot_info method"""
-        mock_notion_service = Mock()
-        mock_notion_service.notion_token = "test_notion_token"
-        mock_notion_service.database_id = "test_database_id"
-        
-        mock_scraper_factory = Mock()
-        mock_scraper_factory.get_supported_websites.return_value = ["daft.ie"]
-        mock_scraper_factory.scrapers = [Mock()]
-        
-        service = TelegramService(
-            bot_token="test_token",
-            notion_service=mock_notion_service,
-            scraper_factory=mock_scraper_factory
+    
+    mocker.patch('app.services.telegram_service._LONG_MESSAGE_FLUSH_DELAY', 0.01)
+    mocker.patch('app.services.telegram_service._CONTINUATION_FLUSH_DELAY', 0.01)
+    mock_process = mocker.patch.object(fresh_telegram_service, '_process_message_text')
+    await fresh_telegram_service.handle_message(make_update(first_chunk), Mock())
+    await fresh_telegram_service.handle_message(make_update(second_chunk), Mock())
+    mock_process.assert_not_called()
+    
+    await asyncio.sleep(0.05)
+    
+    mock_process.assert_called_once()
+    assert mock_process.call_args[0][1] == first_chunk + second_chunk
+    assert fresh_telegram_service._pending_buffers == {}
+
+
+async def test_other_sender_is_not_merged_into_buffered_message(fresh_telegram_service, mocker):
+    """Test that a message from another group member does not join a pending buffer"""
+    long_message = "https://www.daft.ie/property/123 " + "x" * 4000
+    other_message = "hello"
+    
+    def make_update(text, user_id):
+        return SimpleNamespace(
+            message=SimpleNamespace(text=text),
+            effective_chat=SimpleNamespace(id=42),
+            effective_user=SimpleNamespace(id=user_id),
         )
-        
-        bot_info = service.get_bot_info()
-        
-        assert bot_info["is_running"] is False
-        assert bot_info["bot_token_configured"] is True
-        assert bot_info["notion_configured"] is True
-        assert bot_info["supported_websites"] == ["daft.ie"]
-        assert bot_info["scraper_count"] == 1
-
-@pytest.mark.asyncio
-class TestTelegramServiceAsync:
-    """Async test cases for TelegramService"""
-    
-    async def test_start_bot_updates_running_status(self):
-        """Test that start_bot method properly updates running status"""
-        service = TelegramService(bot_token="test_token")
-        
-        # Mock the application setup to avoid actual Telegram API calls
-        with patch.object(service, 'application', None):
-            with patch('app.services.telegram_service.Application') as mock_app_class:
-                mock_app = Mock()
-                mock_app_class.builder.return_value.token.return_value.build.return_value = mock_app
-                
-                # Mock async methods
-                mock_app.initialize = Mock(return_value=None)
-                mock_app.start = Mock(return_value=None)
-                mock_app.updater.start_polling = Mock(return_value=None)
-                
-                await service.start_bot()
-                
-                assert service.is_running is True
-    
-    async def test_stop_bot_updates_running_status(self):
-        """Test that stop_bot method properly updates running status"""
-        service = TelegramService(bot_token="test_token")
-        service.is_running = True
-        
-        # Mock the application
-        mock_app = Mock()
-        mock_app.updater.stop = Mock(return_value=None)
-        mock_app.stop = Mock(return_value=None)
-        mock_app.shutdown = Mock(return_value=None)
-        service.application = mock_app
-        
-        await service.stop_bot()
-        
-        assert service.is_running is False 
-    
-    async def test_group_chat_message_handling(self):
-        """Test that bot properly handles messages in group chats with username prefixes"""
-        service = TelegramService(bot_token="test_token")
-        
-        # Create a mock update with group chat context
-        mock_update = Mock()
-        mock_update.message.text = "https://www.daft.ie/property/123"
-        mock_update.effective_user.id = 12345
-        mock_update.effective_user.username = "testuser"
-        mock_update.effective_user.first_name = "Test"
-        mock_update.effective_chat.type = "group"
-        
-        # Mock the message reply method
-        mock_message = Mock()
-        mock_update.message.reply_text = Mock(return_value=mock_message)
-        mock_message.edit_text = Mock(return_value=None)
-        
-        # Mock the URL processing to avoid actual scraping
-        with patch.object(service, '_process_property_url') as mock_process:
-            await service.handle_message(mock_update, Mock())
-            
-            # Verify that the message was processed
-            mock_process.assert_called_once()
-            
-            # Verify that the first call includes the update, URL, and username
-            call_args = mock_process.call_args[0]
-            assert call_args[0] == mock_update
-            assert call_args[1] == "https://www.daft.ie/property/123"
-            assert call_args[2] == "testuser" 
-    
-    async def test_private_chat_message_handling(self):
-        """Test that bot properly handles messages in private chats without username prefixes"""
-        service = TelegramService(bot_token="test_token")
-        
-        # Create a mock update with private chat context
-        mock_update = Mock()
-        mock_update.message.text = "https://www.daft.ie/property/123"
-        mock_update.effective_user.id = 12345
-        mock_update.effective_user.username = "testuser"
-        mock_update.effective_user.first_name = "Test"
-        mock_update.effective_chat.type = "private"
-        
-        # Mock the message reply method
-        mock_message = Mock()
-        mock_update.message.reply_text = Mock(return_value=mock_message)
-        mock_message.edit_text = Mock(return_value=None)
-        
-        # Mock the URL processing to avoid actual scraping
-        with patch.object(service, '_process_property_url') as mock_process:
-            await service.handle_message(mock_update, Mock())
-            
-            # Verify that the message was processed
-            mock_process.assert_called_once()
-            
-            # Verify that the first call includes the update, URL, and username
-            call_args = mock_process.call_args[0]
-            assert call_args[0] == mock_update
-            assert call_args[1] == "https://www.daft.ie/property/123"
-            assert call_args[2] == "testuser" 
\ No newline at end of file
+    
+    mocker.patch('app.services.telegram_service._LONG_MESSAGE_FLUSH_DELAY', 0.01)
+    mock_process = mocker.patch.object(fresh_telegram_service, '_process_message_text')
+    await fresh_telegram_service.handle_message(make_update(long_message, 1), Mock())
+    await fresh_telegram_service.handle_message(make_update(other_message, 2), Mock())
+    
+    mock_process.assert_called_once()
+    assert mock_process.call_args[0][1] == other_message
+    
+    await asyncio.sleep(0.05)
+    
+    assert mock_process.call_count == 2
+    assert mock_process.call_args[0][1] == long_message
+
+
+async def test_stop_bot_cancels_buffered_and_running_flushes(fresh_telegram_service, mocker):
+    """Test that no buffered message is processed after the bot stops"""
+    fresh_telegram_service.is_running = True
+    fresh_telegram_service.application = Mock()
+    fresh_telegram_service.application.updater.stop = AsyncMock()
+    fresh_telegram_service.application.stop = AsyncMock()
+    fresh_telegram_service.application.shutdown = AsyncMock()
+    
+    long_message = "https://www.daft.ie/property/123 " + "x" * 4000
+    started = asyncio.Event()
+    finished = []
+    
+    async def slow_process(update, message_text):
+        started.set()
+        await asyncio.sleep(10)
+        finished.append(message_text)
+    
+    def make_update(text, user_id):
+        return SimpleNamespace(
+            message=SimpleNamespace(text=text),
+            effective_chat=SimpleNamespace(id=42),
+            effective_user=SimpleNamespace(id=user_id),
+        )
+    
+    mocker.patch('app.services.telegram_service._LONG_MESSAGE_FLUSH_DELAY', 0.01)
+    mock_process = mocker.patch.object(fresh_telegram_service, '_process_message_text', side_effect=slow_process)
+    await fresh_telegram_service.handle_message(make_update(long_message, 1), Mock())
+    await asyncio.wait_for(started.wait(), timeout=1)
+    await fresh_telegram_service.handle_message(make_update(long_message, 2), Mock())
+    
+    await fresh_telegram_service.stop_bot()
+    await asyncio.sleep(0.05)
+    
+    mock_process.assert_called_once()
+    assert finished == []
+    assert fresh_telegram_service._pending_buffers == {}
+    assert fresh_telegram_service._flush_tasks == set()
+
+
+async def test_duplicate_urls_are_processed_once(fresh_telegram_service, mocker):
+    """Test that a URL repeated in one message is only processed once"""
+    mock_update = SimpleNamespace(
+        message=SimpleNamespace(text="https://www.daft.ie/property/123 https://www.daft.ie/property/123"),
+        effective_user=SimpleNamespace(id=12345, username="testuser", first_name="Test"),
+        effective_chat=SimpleNamespace(id=12345, type="private"),
+    )
+    
+    mock_process = mocker.patch.object(fresh_telegram_service, '_process_property_url')
+    await fresh_telegram_service.handle_message(mock_update, Mock())
+    
+    mock_process.assert_called_once_with(mock_update, "https://www.daft.ie/property/123", "testuser")
+
+
+async def test_send_chunks_edits_first_part_and_replies_rest(fresh_telegram_service):
+    """Test that long replies edit the first part and fall back to plain text on bad Markdown"""
+    mock_update = SimpleNamespace(message=SimpleNamespace(
+        reply_text=AsyncMock(side_effect=[BadRequest("Can't parse entities"), None])
+    ))
+    processing_msg = SimpleNamespace(edit_text=AsyncMock())
+    
+    await fresh_telegram_service._send_chunks(mock_update, processing_msg, ["a" * 3000 + "\n", "b" * 3000])
+    
+    processing_msg.edit_text.assert_called_once_with("a" * 3000, parse_mode='Markdown')
+    assert mock_update.message.reply_text.call_count == 2
+    mock_update.message.reply_text.assert_called_with("b" * 3000)